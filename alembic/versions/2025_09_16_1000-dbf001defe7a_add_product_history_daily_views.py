@@ -0,0 +1,73 @@
+"""add_product_history_daily_views
+
+Revision ID: dbf001defe7a
+Revises: bda912b2771b
+Create Date: 2025-09-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'dbf001defe7a'
+down_revision: Union[str, None] = 'bda912b2771b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create daily summary materialized views for price/rank history.
+
+    Each view stores one row per (product_id, day) with the value sum and
+    sample count, so cross-product daily averages can be computed as
+    sum(value_sum) / sum(sample_count). The unique index is required for
+    REFRESH MATERIALIZED VIEW CONCURRENTLY.
+    """
+    op.execute("""
+    CREATE MATERIALIZED VIEW IF NOT EXISTS product_price_daily AS
+    SELECT
+        product_id,
+        recorded_at::date AS day,
+        sum(price) AS value_sum,
+        count(*)::integer AS sample_count
+    FROM product_price_history
+    WHERE price IS NOT NULL
+    GROUP BY product_id, recorded_at::date
+    """)
+    op.execute("""
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_product_price_daily_product_day
+    ON product_price_daily (product_id, day)
+    """)
+    op.execute("""
+    CREATE INDEX IF NOT EXISTS ix_product_price_daily_day
+    ON product_price_daily (day)
+    """)
+
+    op.execute("""
+    CREATE MATERIALIZED VIEW IF NOT EXISTS product_rank_daily AS
+    SELECT
+        product_id,
+        recorded_at::date AS day,
+        sum(rank)::numeric AS value_sum,
+        count(*)::integer AS sample_count
+    FROM product_rank_history
+    WHERE rank IS NOT NULL
+    GROUP BY product_id, recorded_at::date
+    """)
+    op.execute("""
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_product_rank_daily_product_day
+    ON product_rank_daily (product_id, day)
+    """)
+    op.execute("""
+    CREATE INDEX IF NOT EXISTS ix_product_rank_daily_day
+    ON product_rank_daily (day)
+    """)
+
+
+def downgrade() -> None:
+    """Drop daily summary materialized views."""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS product_rank_daily")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS product_price_daily")
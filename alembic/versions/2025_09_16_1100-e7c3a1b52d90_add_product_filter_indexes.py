@@ -0,0 +1,57 @@
+"""add_product_filter_indexes
+
+Revision ID: e7c3a1b52d90
+Revises: dbf001defe7a
+Create Date: 2025-09-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c3a1b52d90'
+down_revision: Union[str, None] = 'dbf001defe7a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add indexes backing the market analyzer product filters.
+
+    Trigram GIN indexes let ILIKE '%term%' on category/brand use an index
+    scan; the composite btree covers the tenant/marketplace/is_deleted
+    equality predicates.
+    """
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'gin_product_category_trgm',
+        'products',
+        ['category'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'category': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'gin_product_brand_trgm',
+        'products',
+        ['brand'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'brand': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_product_tenant_marketplace_deleted',
+        'products',
+        ['tenant_id', 'marketplace', 'is_deleted'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Drop product filter indexes."""
+    op.drop_index('ix_product_tenant_marketplace_deleted', table_name='products')
+    op.drop_index('gin_product_brand_trgm', table_name='products')
+    op.drop_index('gin_product_category_trgm', table_name='products')
@@ -2,6 +2,7 @@
 
 import json
 import logging
+import math
 from datetime import datetime
 from typing import Any, Optional
 
@@ -120,15 +121,39 @@ class CompetitorReportGenerator:
         
         # 添加竞品概览
         total_competitors = len(competitors)
-        avg_price = sum(c.get('price', 0) for c in competitors if c.get('price')) / len([c for c in competitors if c.get('price')]) if competitors else 0
-        avg_rating = sum(c.get('rating', 0) for c in competitors if c.get('rating')) / len([c for c in competitors if c.get('rating')]) if competitors else 0
+
+        # 单次遍历同时统计价格总和/区间和评分总和
+        price_sum = 0.0
+        price_count = 0
+        min_price = math.inf
+        max_price = -math.inf
+        rating_sum = 0.0
+        rating_count = 0
+        for c in competitors:
+            price = c.get('price')
+            if price:
+                price_sum += price
+                price_count += 1
+                if price < min_price:
+                    min_price = price
+                if price > max_price:
+                    max_price = price
+            rating = c.get('rating')
+            if rating:
+                rating_sum += rating
+                rating_count += 1
+
+        avg_price = price_sum / price_count if price_count else 0
+        avg_rating = rating_sum / rating_count if rating_count else 0
+        if not price_count:
+            min_price = max_price = 0
         
         overview = f"""
 ### 竞品概览
 - **竞品总数**: {total_competitors}
 - **平均价格**: ${avg_price:.2f}
 - **平均评分**: {avg_rating:.1f}/5.0
-- **价格区间**: ${min(c.get('price', 0) for c in competitors if c.get('price', 0)):.2f} - ${max(c.get('price', 0) for c in competitors if c.get('price', 0)):.2f}
+- **价格区间**: ${min_price:.2f} - ${max_price:.2f}
 
 ### 详细竞品信息
         """
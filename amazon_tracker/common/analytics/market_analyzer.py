@@ -1,25 +1,117 @@
 """市场趋势分析器"""
 
+import asyncio
 import logging
-import statistics
-from dataclasses import dataclass
+import math
+from collections import Counter
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from typing import Any, Optional
 
+from sqlalchemy import ColumnElement, Row, func, literal, select, union_all
 from sqlalchemy.orm import Session
 
+from ..cache.redis_manager import cache_result
 from ..database.connection import get_db_session
 from ..database.models.product import (
     MarketplaceType,
     Product,
-    ProductPriceHistory,
-    ProductRankHistory,
+    product_price_daily,
+    product_rank_daily,
 )
 
 logger = logging.getLogger(__name__)
 
-
-@dataclass
+# 时间周期到天数的映射
+_TIME_PERIOD_DAYS = {"7d": 7, "30d": 30, "90d": 90, "1y": 365}
+
+# 基于历史数据按日汇总的指标及其物化视图
+_DAILY_SUMMARY_VIEWS = {"price": product_price_daily, "rank": product_rank_daily}
+
+# 市场趋势结果缓存时间（秒），数据按天聚合，变化缓慢
+MARKET_TRENDS_CACHE_TTL = 60 * 60
+
+
+def _market_trends_cache_key(
+    _analyzer: "MarketTrendAnalyzer",
+    tenant_id: str,
+    category: Optional[str] = None,
+    brand: Optional[str] = None,
+    marketplace: Optional[MarketplaceType] = None,
+    time_period: str = "30d",
+    metrics: Optional[list[str]] = None,
+) -> str:
+    """生成市场趋势缓存键（按小时分桶，保证至少每小时重新计算一次）"""
+    marketplace_value = (marketplace or MarketplaceType.AMAZON_US).value
+    metrics_key = ",".join(sorted(metrics)) if metrics else "default"
+    hour_bucket = datetime.utcnow().strftime("%Y%m%d%H")
+    return (
+        f"{tenant_id}:{marketplace_value}:{category or ''}:{brand or ''}:"
+        f"{time_period}:{metrics_key}:{hour_bucket}"
+    )
+
+
+def _is_cacheable_trends(result: dict[str, Any]) -> bool:
+    """错误结果（如暂无匹配产品）不缓存，新产品加入后可立即看到分析结果"""
+    return "error" not in result
+
+
+def _series_summary(
+    values: list[float], lower_is_better: bool = False
+) -> dict[str, Any]:
+    """汇总序列的期初/期末值和变化百分比
+
+    lower_is_better为True时（如排名），数值降低记为正向变化。
+    """
+    first = values[0]
+    last = values[-1]
+    change = first - last if lower_is_better else last - first
+    return {
+        "first": first,
+        "last": last,
+        "change_percent": change / first * 100 if first else 0.0,
+        "data_points": len(values),
+    }
+
+
+def _sample_stdev(values: list[float]) -> float:
+    """样本标准差（两次遍历的纯浮点实现，避免statistics模块的精确分数运算开销）"""
+    n = len(values)
+    if n < 2:
+        return 0.0
+    mean = sum(values) / n
+    return math.sqrt(sum((v - mean) ** 2 for v in values) / (n - 1))
+
+
+def _forecast_kernel(values: list[float]) -> tuple[float, float]:
+    """计算线性趋势和基于相邻变化一致性的置信度
+
+    Returns:
+        (trend, confidence)：trend为每个数据点的平均变化量，confidence限制在0.3-0.9之间
+    """
+    n = len(values)
+    trend = (values[-1] - values[0]) / n
+    if n <= 2:
+        return trend, 0.5
+
+    # 相邻差值的均值可直接由首尾值得到，无需构造差值列表求和
+    mean_change = (values[-1] - values[0]) / (n - 1)
+    if mean_change == 0:
+        return trend, 0.5
+
+    squared = 0.0
+    previous = values[0]
+    for value in values[1:]:
+        deviation = value - previous - mean_change
+        squared += deviation * deviation
+        previous = value
+    stdev = math.sqrt(squared / (n - 2))
+
+    consistency = 1 - stdev / abs(mean_change)
+    return trend, max(0.3, min(0.9, consistency))
+
+
+@dataclass(slots=True, frozen=True)
 class TrendDataPoint:
     """趋势数据点"""
 
@@ -29,7 +121,7 @@ class TrendDataPoint:
     volume: Optional[int] = None  # 数据点数量
 
 
-@dataclass
+@dataclass(slots=True)
 class MarketInsight:
     """市场洞察"""
 
@@ -38,9 +130,10 @@ class MarketInsight:
     description: str
     confidence: float
     data: dict[str, Any]
+    direction: Optional[str] = None  # 趋势方向: "up" / "down"
 
 
-@dataclass
+@dataclass(slots=True)
 class MarketForecast:
     """市场预测"""
 
@@ -58,6 +151,12 @@ class MarketTrendAnalyzer:
     def __init__(self):
         self.logger = logging.getLogger(self.__class__.__name__)
 
+    @cache_result(
+        ttl=MARKET_TRENDS_CACHE_TTL,
+        prefix="market_trends",
+        key_generator=_market_trends_cache_key,
+        should_cache=_is_cacheable_trends,
+    )
     async def analyze_market_trends(
         self,
         tenant_id: str,
@@ -77,11 +176,14 @@ class MarketTrendAnalyzer:
         end_date = datetime.utcnow()
         start_date = end_date - timedelta(days=days)
 
+        # 产品过滤条件，同时用于产品查询和历史数据的JOIN查询
+        product_filters = self._build_product_filters(
+            tenant_id, category, brand, marketplace
+        )
+
         with get_db_session() as db:
             # 获取符合条件的产品
-            products = self._get_filtered_products(
-                db, tenant_id, category, brand, marketplace
-            )
+            products = self._get_filtered_products(db, product_filters)
 
             if not products:
                 return {
@@ -94,44 +196,55 @@ class MarketTrendAnalyzer:
                     },
                 }
 
+            # 单次遍历提取评分、评论数和库存状态，供各分析器共用
+            ratings, review_counts, availabilities = self._extract_product_metrics(
+                products
+            )
+
             # 分析各个指标
             trend_data = {}
             insights = []
 
-            if "price" in metrics:
-                price_trends = await self._analyze_price_trends(
-                    db, products, start_date, end_date
+            # 价格/排名的日均值通过一次UNION ALL查询取回，在线程中使用独立会话执行
+            daily_averages = {}
+            daily_metrics = [m for m in _DAILY_SUMMARY_VIEWS if m in metrics]
+            if daily_metrics:
+                daily_averages = await asyncio.to_thread(
+                    self._query_daily_averages,
+                    daily_metrics,
+                    product_filters,
+                    start_date,
+                    end_date,
                 )
-                trend_data["price"] = price_trends["data"]
-                insights.extend(price_trends["insights"])
 
+            # 各指标分析相互独立，并发执行
+            analyzers = {}
+            if "price" in metrics:
+                analyzers["price"] = self._analyze_price_trends(
+                    daily_averages.get("price", [])
+                )
             if "rank" in metrics:
-                rank_trends = await self._analyze_rank_trends(
-                    db, products, start_date, end_date
+                analyzers["rank"] = self._analyze_rank_trends(
+                    daily_averages.get("rank", [])
                 )
-                trend_data["rank"] = rank_trends["data"]
-                insights.extend(rank_trends["insights"])
-
             if "rating" in metrics:
-                rating_trends = await self._analyze_rating_trends(
-                    db, products, start_date, end_date
-                )
-                trend_data["rating"] = rating_trends["data"]
-                insights.extend(rating_trends["insights"])
-
+                analyzers["rating"] = self._analyze_rating_trends(ratings, end_date)
             if "review_count" in metrics:
-                review_trends = await self._analyze_review_trends(
-                    db, products, start_date, end_date
+                analyzers["review_count"] = self._analyze_review_trends(
+                    review_counts, end_date
                 )
-                trend_data["review_count"] = review_trends["data"]
-                insights.extend(review_trends["insights"])
-
             if "availability" in metrics:
-                availability_trends = await self._analyze_availability_trends(
-                    db, products, start_date, end_date
+                analyzers["availability"] = self._analyze_availability_trends(
+                    availabilities, end_date
                 )
-                trend_data["availability"] = availability_trends["data"]
-                insights.extend(availability_trends["insights"])
+
+            results = await asyncio.gather(*analyzers.values())
+            trend_summary = {}
+            for metric, result in zip(analyzers, results, strict=True):
+                trend_data[metric] = result["data"]
+                insights.extend(result["insights"])
+                if "summary" in result:
+                    trend_summary[metric] = result["summary"]
 
             # 生成预测
             forecast = self._generate_forecast(trend_data, metrics)
@@ -148,9 +261,10 @@ class MarketTrendAnalyzer:
                 "time_period": time_period,
                 "product_count": len(products),
                 "trend_data": trend_data,
+                "trend_summary": trend_summary,
                 "insights": {
                     "summary": market_insights,
-                    "detailed": [insight.__dict__ for insight in insights],
+                    "detailed": [asdict(insight) for insight in insights],
                 },
                 "forecast": forecast,
                 "generated_at": datetime.utcnow().isoformat(),
@@ -158,300 +272,284 @@ class MarketTrendAnalyzer:
 
     def _parse_time_period(self, time_period: str) -> int:
         """解析时间周期"""
-        period_map = {"7d": 7, "30d": 30, "90d": 90, "1y": 365}
-        return period_map.get(time_period, 30)
+        return _TIME_PERIOD_DAYS.get(time_period, 30)
 
-    def _get_filtered_products(
+    def _build_product_filters(
         self,
-        db: Session,
         tenant_id: str,
         category: Optional[str],
         brand: Optional[str],
         marketplace: MarketplaceType,
-    ) -> list[Product]:
-        """获取过滤后的产品列表"""
+    ) -> list[ColumnElement[bool]]:
+        """构建产品过滤条件"""
 
-        query = db.query(Product).filter(
+        filters = [
             Product.tenant_id == tenant_id,
             Product.marketplace == marketplace,
             Product.is_deleted == False,
-        )
+        ]
 
         if category:
-            query = query.filter(Product.category.ilike(f"%{category}%"))
+            filters.append(Product.category.ilike(f"%{category}%"))
 
         if brand:
-            query = query.filter(Product.brand.ilike(f"%{brand}%"))
+            filters.append(Product.brand.ilike(f"%{brand}%"))
 
-        return query.all()
+        return filters
 
-    async def _analyze_price_trends(
+    def _get_filtered_products(
+        self, db: Session, product_filters: list[ColumnElement[bool]]
+    ) -> list[Row]:
+        """获取过滤后的产品列表
+
+        只查询趋势分析用到的列，避免加载描述、JSONB等大字段。
+        """
+
+        return (
+            db.query(
+                Product.current_rating,
+                Product.current_review_count,
+                Product.current_availability,
+            )
+            .filter(*product_filters)
+            .all()
+        )
+
+    def _extract_product_metrics(
+        self, products: list[Row]
+    ) -> tuple[list[float], list[int], list[Optional[str]]]:
+        """一次遍历产品，提取评分列表、评论数列表和库存状态列表"""
+        ratings = []
+        review_counts = []
+        availabilities = []
+
+        for product in products:
+            rating = product.current_rating
+            if rating:
+                ratings.append(float(rating))
+            review_count = product.current_review_count
+            if review_count:
+                review_counts.append(review_count)
+            availabilities.append(product.current_availability)
+
+        return ratings, review_counts, availabilities
+
+    def _query_daily_averages(
         self,
-        db: Session,
-        products: list[Product],
+        daily_metrics: list[str],
+        product_filters: list[ColumnElement[bool]],
         start_date: datetime,
         end_date: datetime,
-    ) -> dict[str, Any]:
-        """分析价格趋势"""
-
-        product_ids = [p.id for p in products]
-
-        # 获取价格历史数据
-        price_history = (
-            db.query(ProductPriceHistory)
-            .filter(
-                ProductPriceHistory.product_id.in_(product_ids),
-                ProductPriceHistory.recorded_at >= start_date,
-                ProductPriceHistory.recorded_at <= end_date,
-                ProductPriceHistory.price.isnot(None),
+    ) -> dict[str, list[tuple[Any, Any, int]]]:
+        """从按日汇总的物化视图聚合跨产品日均值
+
+        各指标的聚合通过UNION ALL合并为一次查询，返回 指标 -> [(day, avg, count)]，
+        每个指标每天一行。使用独立会话，便于在线程中执行。通过JOIN产品表应用过滤条件，
+        避免产品多时生成超长的IN列表。
+        """
+        aggregates = []
+        for metric in daily_metrics:
+            daily_view = _DAILY_SUMMARY_VIEWS[metric]
+            day = daily_view.c.day
+            sample_count = func.sum(daily_view.c.sample_count)
+            aggregates.append(
+                select(
+                    literal(metric).label("metric"),
+                    day.label("day"),
+                    (func.sum(daily_view.c.value_sum) / sample_count).label("avg_value"),
+                    sample_count.label("sample_count"),
+                )
+                .join(Product, Product.id == daily_view.c.product_id)
+                .where(
+                    *product_filters,
+                    day >= start_date.date(),
+                    day <= end_date.date(),
+                )
+                .group_by(day)
             )
-            .order_by(ProductPriceHistory.recorded_at)
-            .all()
-        )
 
-        if not price_history:
-            return {"data": [], "insights": []}
+        statement = union_all(*aggregates).order_by("metric", "day")
+
+        daily_averages: dict[str, list[tuple[Any, Any, int]]] = {
+            metric: [] for metric in daily_metrics
+        }
+        with get_db_session() as db:
+            for row in db.execute(statement):
+                daily_averages[row.metric].append(
+                    (row.day, row.avg_value, row.sample_count)
+                )
 
-        # 按日期聚合数据
-        daily_data = {}
-        for record in price_history:
-            date_key = record.recorded_at.date()
-            if date_key not in daily_data:
-                daily_data[date_key] = []
-            daily_data[date_key].append(record.price)
+        return daily_averages
 
-        # 计算每日平均价格
-        trend_points = []
+    async def _analyze_price_trends(
+        self, daily_prices: list[tuple[Any, Any, int]]
+    ) -> dict[str, Any]:
+        """分析价格趋势
+
+        Args:
+            daily_prices: 按日期排序的 (day, 平均价格, 样本数)
+        """
+
+        if not daily_prices:
+            return {"data": [], "insights": []}
+
+        # 计算每日平均价格，同一次遍历中构造输出并收集洞察所需的原始值
+        data = []
+        values = []
+        changes = []
         previous_avg = None
 
-        for date in sorted(daily_data.keys()):
-            prices = daily_data[date]
-            avg_price = statistics.mean(prices)
+        for date, avg_price, price_count in daily_prices:
+            avg_price = float(avg_price)
 
             change_percent = None
             if previous_avg:
                 change_percent = (avg_price - previous_avg) / previous_avg * 100
+                if change_percent:
+                    changes.append(change_percent)
 
-            trend_points.append(
-                TrendDataPoint(
-                    date=datetime.combine(date, datetime.min.time()),
-                    value=avg_price,
-                    change_percent=change_percent,
-                    volume=len(prices),
-                )
+            values.append(avg_price)
+            data.append(
+                {
+                    "date": f"{date.isoformat()}T00:00:00",
+                    "value": round(avg_price, 2),
+                    "change_percent": round(change_percent, 2)
+                    if change_percent
+                    else None,
+                    "volume": int(price_count),
+                }
             )
 
             previous_avg = avg_price
 
         # 生成价格洞察
-        insights = self._generate_price_insights(trend_points)
+        insights = self._generate_price_insights(values, changes)
 
         return {
-            "data": [
-                {
-                    "date": point.date.isoformat(),
-                    "value": round(point.value, 2),
-                    "change_percent": round(point.change_percent, 2)
-                    if point.change_percent
-                    else None,
-                    "volume": point.volume,
-                }
-                for point in trend_points
-            ],
+            "data": data,
             "insights": insights,
+            "summary": _series_summary(values),
         }
 
     async def _analyze_rank_trends(
-        self,
-        db: Session,
-        products: list[Product],
-        start_date: datetime,
-        end_date: datetime,
+        self, daily_ranks: list[tuple[Any, Any, int]]
     ) -> dict[str, Any]:
-        """分析排名趋势"""
-
-        product_ids = [p.id for p in products]
-
-        # 获取排名历史数据
-        rank_history = (
-            db.query(ProductRankHistory)
-            .filter(
-                ProductRankHistory.product_id.in_(product_ids),
-                ProductRankHistory.recorded_at >= start_date,
-                ProductRankHistory.recorded_at <= end_date,
-                ProductRankHistory.rank.isnot(None),
-            )
-            .order_by(ProductRankHistory.recorded_at)
-            .all()
-        )
+        """分析排名趋势
 
-        if not rank_history:
-            return {"data": [], "insights": []}
+        Args:
+            daily_ranks: 按日期排序的 (day, 平均排名, 样本数)
+        """
 
-        # 按日期聚合数据
-        daily_data = {}
-        for record in rank_history:
-            date_key = record.recorded_at.date()
-            if date_key not in daily_data:
-                daily_data[date_key] = []
-            daily_data[date_key].append(record.rank)
+        if not daily_ranks:
+            return {"data": [], "insights": []}
 
-        # 计算每日平均排名
-        trend_points = []
+        # 计算每日平均排名，同一次遍历中构造输出
+        data = []
+        values = []
         previous_avg = None
 
-        for date in sorted(daily_data.keys()):
-            ranks = daily_data[date]
-            avg_rank = statistics.mean(ranks)
+        for date, avg_rank, rank_count in daily_ranks:
+            avg_rank = float(avg_rank)
 
             change_percent = None
             if previous_avg:
                 # 排名降低是好事，所以计算方式相反
                 change_percent = (previous_avg - avg_rank) / previous_avg * 100
 
-            trend_points.append(
-                TrendDataPoint(
-                    date=datetime.combine(date, datetime.min.time()),
-                    value=avg_rank,
-                    change_percent=change_percent,
-                    volume=len(ranks),
-                )
+            values.append(avg_rank)
+            data.append(
+                {
+                    "date": f"{date.isoformat()}T00:00:00",
+                    "value": round(avg_rank, 0),
+                    "change_percent": round(change_percent, 2)
+                    if change_percent
+                    else None,
+                    "volume": int(rank_count),
+                }
             )
 
             previous_avg = avg_rank
 
         # 生成排名洞察
-        insights = self._generate_rank_insights(trend_points)
+        insights = self._generate_rank_insights(values)
 
         return {
-            "data": [
-                {
-                    "date": point.date.isoformat(),
-                    "value": round(point.value, 0),
-                    "change_percent": round(point.change_percent, 2)
-                    if point.change_percent
-                    else None,
-                    "volume": point.volume,
-                }
-                for point in trend_points
-            ],
+            "data": data,
             "insights": insights,
+            "summary": _series_summary(values, lower_is_better=True),
         }
 
     async def _analyze_rating_trends(
-        self,
-        db: Session,
-        products: list[Product],
-        start_date: datetime,
-        end_date: datetime,
+        self, current_ratings: list[float], end_date: datetime
     ) -> dict[str, Any]:
         """分析评分趋势"""
 
         # 由于评分变化较慢，我们使用产品当前评分来分析趋势
         # 这里可以扩展为基于评分历史记录的分析
 
-        current_ratings = [p.rating for p in products if p.rating]
-
         if not current_ratings:
             return {"data": [], "insights": []}
 
         # 生成模拟的趋势数据（实际应用中需要真实的评分历史）
-        trend_points = []
-        avg_rating = statistics.mean(current_ratings)
+        avg_rating = sum(current_ratings) / len(current_ratings)
+        volume = len(current_ratings)
 
-        # 生成过去30天的数据点
+        # 生成过去30天的数据点，直接构造输出字典
+        data = []
         for i in range(30):
-            date = end_date - timedelta(days=29 - i)
             # 添加小幅随机变化来模拟趋势
             variation = (i - 15) * 0.001  # 小幅趋势
-            rating = avg_rating + variation
-
-            trend_points.append(
-                TrendDataPoint(
-                    date=date,
-                    value=max(1.0, min(5.0, rating)),  # 限制在1-5之间
-                    change_percent=variation / avg_rating * 100 if i > 0 else None,
-                    volume=len(current_ratings),
-                )
-            )
-
-        # 生成评分洞察
-        insights = self._generate_rating_insights(trend_points, current_ratings)
+            change_percent = variation / avg_rating * 100 if i > 0 else None
 
-        return {
-            "data": [
+            data.append(
                 {
-                    "date": point.date.isoformat(),
-                    "value": round(point.value, 2),
-                    "change_percent": round(point.change_percent, 3)
-                    if point.change_percent
+                    "date": (end_date - timedelta(days=29 - i)).isoformat(),
+                    # 限制在1-5之间
+                    "value": round(max(1.0, min(5.0, avg_rating + variation)), 2),
+                    "change_percent": round(change_percent, 3)
+                    if change_percent
                     else None,
-                    "volume": point.volume,
+                    "volume": volume,
                 }
-                for point in trend_points
-            ],
-            "insights": insights,
-        }
+            )
+
+        # 生成评分洞察
+        insights = self._generate_rating_insights(current_ratings)
+
+        return {"data": data, "insights": insights}
 
     async def _analyze_review_trends(
-        self,
-        db: Session,
-        products: list[Product],
-        start_date: datetime,
-        end_date: datetime,
+        self, current_reviews: list[int], end_date: datetime
     ) -> dict[str, Any]:
         """分析评论数量趋势"""
 
-        current_reviews = [p.review_count for p in products if p.review_count]
-
         if not current_reviews:
             return {"data": [], "insights": []}
 
         # 生成模拟的评论增长趋势
-        trend_points = []
-        avg_reviews = statistics.mean(current_reviews)
+        avg_reviews = sum(current_reviews) / len(current_reviews)
+        volume = len(current_reviews)
+        growth_rate = 0.02  # 每天2%的增长
 
+        data = []
         for i in range(30):
-            date = end_date - timedelta(days=29 - i)
             # 模拟评论数量的增长
-            growth_rate = 0.02  # 每天2%的增长
-            reviews = avg_reviews * (1 + growth_rate * i / 30)
-
-            change_percent = growth_rate if i > 0 else None
-
-            trend_points.append(
-                TrendDataPoint(
-                    date=date,
-                    value=reviews,
-                    change_percent=change_percent,
-                    volume=len(current_reviews),
-                )
+            data.append(
+                {
+                    "date": (end_date - timedelta(days=29 - i)).isoformat(),
+                    "value": round(avg_reviews * (1 + growth_rate * i / 30), 0),
+                    "change_percent": round(growth_rate, 2) if i > 0 else None,
+                    "volume": volume,
+                }
             )
 
         # 生成评论洞察
-        insights = self._generate_review_insights(trend_points, current_reviews)
+        insights = self._generate_review_insights(current_reviews)
 
-        return {
-            "data": [
-                {
-                    "date": point.date.isoformat(),
-                    "value": round(point.value, 0),
-                    "change_percent": round(point.change_percent, 2)
-                    if point.change_percent
-                    else None,
-                    "volume": point.volume,
-                }
-                for point in trend_points
-            ],
-            "insights": insights,
-        }
+        return {"data": data, "insights": insights}
 
     async def _analyze_availability_trends(
-        self,
-        db: Session,
-        products: list[Product],
-        start_date: datetime,
-        end_date: datetime,
+        self, availabilities: list[Optional[str]], end_date: datetime
     ) -> dict[str, Any]:
         """分析库存可用性趋势"""
 
@@ -460,39 +558,45 @@ class MarketTrendAnalyzer:
         out_of_stock_count = 0
         unknown_count = 0
 
-        for product in products:
-            if product.availability:
-                if "in stock" in product.availability.lower():
-                    in_stock_count += 1
-                elif "out of stock" in product.availability.lower():
-                    out_of_stock_count += 1
-                else:
-                    unknown_count += 1
+        # 库存状态取值很少，按不同取值计数后每种只做一次小写转换和匹配
+        for availability, count in Counter(availabilities).items():
+            if not availability:
+                unknown_count += count
+                continue
+
+            availability_lc = availability.lower()
+            if "in stock" in availability_lc:
+                in_stock_count += count
+            elif "out of stock" in availability_lc:
+                out_of_stock_count += count
             else:
-                unknown_count += 1
+                unknown_count += count
 
-        total_products = len(products)
+        total_products = len(availabilities)
         availability_rate = (
             in_stock_count / total_products * 100 if total_products > 0 else 0
         )
 
-        # 生成模拟的可用性趋势
-        trend_points = []
+        # 生成模拟的可用性趋势，直接构造输出字典
+        data = []
         for i in range(30):
-            date = end_date - timedelta(days=29 - i)
             # 添加随机变化来模拟可用性波动
             variation = (i % 7 - 3) * 2  # 每周的波动
-            rate = max(70, min(100, availability_rate + variation))
-
-            trend_points.append(
-                TrendDataPoint(
-                    date=date,
-                    value=rate,
-                    change_percent=variation / availability_rate * 100
-                    if i > 0 and availability_rate > 0
+            change_percent = (
+                variation / availability_rate * 100
+                if i > 0 and availability_rate > 0
+                else None
+            )
+
+            data.append(
+                {
+                    "date": (end_date - timedelta(days=29 - i)).isoformat(),
+                    "value": round(max(70, min(100, availability_rate + variation)), 1),
+                    "change_percent": round(change_percent, 2)
+                    if change_percent
                     else None,
-                    volume=total_products,
-                )
+                    "volume": total_products,
+                }
             )
 
         # 生成可用性洞察
@@ -508,33 +612,25 @@ class MarketTrendAnalyzer:
                 )
             )
 
-        return {
-            "data": [
-                {
-                    "date": point.date.isoformat(),
-                    "value": round(point.value, 1),
-                    "change_percent": round(point.change_percent, 2)
-                    if point.change_percent
-                    else None,
-                    "volume": point.volume,
-                }
-                for point in trend_points
-            ],
-            "insights": insights,
-        }
+        return {"data": data, "insights": insights}
 
     def _generate_price_insights(
-        self, trend_points: list[TrendDataPoint]
+        self, values: list[float], changes: list[float]
     ) -> list[MarketInsight]:
-        """生成价格洞察"""
+        """生成价格洞察
+
+        Args:
+            values: 每日平均价格
+            changes: 非零的每日价格变化百分比
+        """
         insights = []
 
-        if len(trend_points) < 2:
+        if len(values) < 2:
             return insights
 
         # 计算总体趋势
-        first_price = trend_points[0].value
-        last_price = trend_points[-1].value
+        first_price = values[0]
+        last_price = values[-1]
         total_change = (last_price - first_price) / first_price * 100
 
         if abs(total_change) > 5:
@@ -546,15 +642,13 @@ class MarketTrendAnalyzer:
                     description=f"过去期间价格{direction}了{abs(total_change):.1f}%",
                     confidence=0.9,
                     data={"change_percent": total_change},
+                    direction="up" if total_change > 0 else "down",
                 )
             )
 
         # 计算波动性
-        changes = [
-            point.change_percent for point in trend_points[1:] if point.change_percent
-        ]
         if changes:
-            volatility = statistics.stdev(changes) if len(changes) > 1 else 0
+            volatility = _sample_stdev(changes)
             if volatility > 5:
                 insights.append(
                     MarketInsight(
@@ -568,18 +662,16 @@ class MarketTrendAnalyzer:
 
         return insights
 
-    def _generate_rank_insights(
-        self, trend_points: list[TrendDataPoint]
-    ) -> list[MarketInsight]:
+    def _generate_rank_insights(self, values: list[float]) -> list[MarketInsight]:
         """生成排名洞察"""
         insights = []
 
-        if len(trend_points) < 2:
+        if len(values) < 2:
             return insights
 
         # 计算排名趋势
-        first_rank = trend_points[0].value
-        last_rank = trend_points[-1].value
+        first_rank = values[0]
+        last_rank = values[-1]
         rank_change = (first_rank - last_rank) / first_rank * 100  # 排名降低是好事
 
         if abs(rank_change) > 10:
@@ -591,18 +683,19 @@ class MarketTrendAnalyzer:
                     description=f"平均排名{direction}了{abs(rank_change):.1f}%",
                     confidence=0.9,
                     data={"change_percent": rank_change},
+                    direction="up" if rank_change > 0 else "down",
                 )
             )
 
         return insights
 
     def _generate_rating_insights(
-        self, trend_points: list[TrendDataPoint], current_ratings: list[float]
+        self, current_ratings: list[float]
     ) -> list[MarketInsight]:
         """生成评分洞察"""
         insights = []
 
-        avg_rating = statistics.mean(current_ratings)
+        avg_rating = sum(current_ratings) / len(current_ratings)
 
         if avg_rating >= 4.5:
             insights.append(
@@ -628,12 +721,12 @@ class MarketTrendAnalyzer:
         return insights
 
     def _generate_review_insights(
-        self, trend_points: list[TrendDataPoint], current_reviews: list[int]
+        self, current_reviews: list[int]
     ) -> list[MarketInsight]:
         """生成评论洞察"""
         insights = []
 
-        avg_reviews = statistics.mean(current_reviews)
+        avg_reviews = sum(current_reviews) / len(current_reviews)
 
         if avg_reviews > 1000:
             insights.append(
@@ -673,28 +766,10 @@ class MarketTrendAnalyzer:
                         point["value"] for point in data_points[-7:]
                     ]  # 使用最近7天
                     if len(values) >= 2:
-                        # 计算趋势
-                        trend = (values[-1] - values[0]) / len(values)
+                        # 计算趋势和置信度（基于数据的一致性）
+                        trend, confidence = _forecast_kernel(values)
                         predicted_value = values[-1] + trend * 7  # 预测7天后
 
-                        # 计算置信度（基于数据的一致性）
-                        if len(values) > 2:
-                            changes = [
-                                values[i] - values[i - 1] for i in range(1, len(values))
-                            ]
-                            consistency = (
-                                1
-                                - (
-                                    statistics.stdev(changes)
-                                    / abs(statistics.mean(changes))
-                                )
-                                if changes and statistics.mean(changes) != 0
-                                else 0.5
-                            )
-                            confidence = max(0.3, min(0.9, consistency))
-                        else:
-                            confidence = 0.5
-
                         # 确定趋势方向
                         if trend > 0:
                             direction = "increasing"
@@ -719,7 +794,7 @@ class MarketTrendAnalyzer:
     def _generate_market_insights(
         self,
         trend_data: dict[str, list],
-        products: list[Product],
+        products: list[Row],
         detailed_insights: list[MarketInsight],
     ) -> dict[str, Any]:
         """生成市场总结洞察"""
@@ -768,7 +843,7 @@ class MarketTrendAnalyzer:
                 insight.insight_type in ["price_trend", "rank_trend"]
                 and insight.confidence > 0.7
             ):
-                if "上涨" in insight.description or "改善" in insight.description:
+                if insight.direction == "up":
                     summary["opportunities"].append(insight.title)
                 else:
                     summary["risks"].append(insight.title)
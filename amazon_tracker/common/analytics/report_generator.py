@@ -1,22 +1,36 @@
 """报告生成器"""
 
+import asyncio
 import base64
 import io
 import json
 import logging
-from dataclasses import dataclass
+import threading
+import uuid
+from dataclasses import asdict, dataclass, is_dataclass
 from datetime import datetime, timedelta
+from html import escape
 from typing import Any, Optional
+from xml.sax.saxutils import escape as xml_escape
 
 try:
-    import matplotlib.pyplot as plt
+    import numpy as np
     import pandas as pd
     import seaborn as sns
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
 
     VISUALIZATION_AVAILABLE = True
 except ImportError:
     VISUALIZATION_AVAILABLE = False
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 try:
     from reportlab.lib.colors import Color, black, blue, green, red
     from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
@@ -37,13 +51,101 @@ try:
 except ImportError:
     PDF_AVAILABLE = False
 
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session, load_only
+
 from ..database.connection import get_db_session
-from ..database.models.product import Product
+from ..database.models.product import Product, ProductStatus
 from .market_analyzer import MarketTrendAnalyzer
 
 logger = logging.getLogger(__name__)
 
 
+def _extract_product_values(
+    products: list[Product],
+) -> tuple[list[float], list[int], list[float]]:
+    """一次遍历产品，提取价格、排名和评分列表（跳过空值并转换为原生数值类型）"""
+    prices = []
+    ranks = []
+    ratings = []
+
+    for p in products:
+        if price := p.current_price:
+            prices.append(float(price))
+        if rank := p.current_rank:
+            ranks.append(rank)
+        if rating := p.current_rating:
+            ratings.append(float(rating))
+
+    return prices, ranks, ratings
+
+
+def _chart_b64(chart: dict[str, Any]) -> str:
+    """获取图表PNG的base64字符串，首次生成后缓存在图表字典中"""
+    if "data" not in chart:
+        chart["data"] = base64.b64encode(chart["png_bytes"]).decode("ascii")
+    return chart["data"]
+
+
+def _json_default(value: Any) -> Any:
+    """JSON序列化的兜底转换：数据类转为字典，字节转为base64，其余类型转为字符串"""
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode("ascii")
+    return str(value)
+
+
+def _dump_report_json(report_data: dict[str, Any]) -> bytes:
+    """将报告数据序列化为缩进格式的UTF-8 JSON（优先使用orjson）"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            report_data,
+            default=_json_default,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(
+        report_data, indent=2, ensure_ascii=False, default=_json_default
+    ).encode("utf-8")
+
+
+# HTML报告模板（模块加载时构建一次）
+_HTML_REPORT_TEMPLATE = """
+<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; }}
+        h1 {{ color: #333; text-align: center; }}
+        h2 {{ color: #666; border-bottom: 2px solid #ddd; padding-bottom: 10px; }}
+        .section {{ margin-bottom: 30px; }}
+        .chart {{ text-align: center; margin: 20px 0; }}
+        pre {{ background: #f4f4f4; padding: 15px; border-radius: 5px; }}
+        .summary {{ background: #f9f9f9; padding: 20px; border-radius: 5px; margin: 20px 0; }}
+    </style>
+</head>
+<body>
+    <h1>{title}</h1>
+    {subtitle}
+
+    {content}
+
+    <div class="summary">
+        <h2>报告总结</h2>
+        <pre>{summary}</pre>
+    </div>
+
+    <footer>
+        <p><small>生成时间: {generated_at}</small></p>
+    </footer>
+</body>
+</html>
+"""
+
+
 @dataclass
 class ReportSection:
     """报告章节"""
@@ -75,6 +177,20 @@ class ReportGenerator:
         self.logger = logging.getLogger(self.__class__.__name__)
         self.market_analyzer = MarketTrendAnalyzer()
 
+        # 每个线程复用自己的Agg画布，避免每张图都经过pyplot创建/销毁Figure
+        self._chart_local = threading.local()
+
+        # PDF样式表是不可变配置，只构建一次
+        if PDF_AVAILABLE:
+            self._pdf_styles = getSampleStyleSheet()
+            self._pdf_title_style = ParagraphStyle(
+                "CustomTitle",
+                parent=self._pdf_styles["Heading1"],
+                fontSize=18,
+                spaceAfter=30,
+                alignment=TA_CENTER,
+            )
+
     async def generate_report(
         self,
         tenant_id: str,
@@ -83,26 +199,34 @@ class ReportGenerator:
         time_period: str = "30d",
         include_charts: bool = True,
         format: str = "pdf",
+        persist: bool = False,
     ) -> GeneratedReport:
-        """生成报告"""
+        """生成报告
+
+        报告内容在内存中生成；persist为True时才额外写入磁盘并返回file_path。
+        """
+
+        # 随机ID避免同一时刻并发生成的报告产生相同ID/文件名
+        report_id = f"report_{uuid.uuid4().hex}"
 
-        report_id = f"report_{datetime.utcnow().timestamp()}"
+        # 只有PDF/HTML会嵌入图表，JSON输出跳过图表渲染（原始数值仍保留在章节数据中）
+        render_charts = include_charts and format in ("pdf", "html")
 
         try:
             # 根据报告类型生成内容
             if report_type == "product":
                 report_data = await self._generate_product_report(
-                    tenant_id, product_ids, time_period, include_charts
+                    tenant_id, product_ids, time_period, render_charts
                 )
             elif report_type == "competitor":
                 raise ValueError("Competitor analysis is currently disabled")
             elif report_type == "market":
                 report_data = await self._generate_market_report(
-                    tenant_id, time_period, include_charts
+                    tenant_id, time_period, render_charts
                 )
             elif report_type == "comprehensive":
                 report_data = await self._generate_comprehensive_report(
-                    tenant_id, product_ids, time_period, include_charts
+                    tenant_id, product_ids, time_period, render_charts
                 )
             else:
                 raise ValueError(f"Unsupported report type: {report_type}")
@@ -110,15 +234,15 @@ class ReportGenerator:
             # 根据格式生成最终报告
             if format == "pdf":
                 content, file_path, file_size = await self._generate_pdf_report(
-                    report_id, report_data, include_charts
+                    report_id, report_data, include_charts, persist
                 )
             elif format == "html":
                 content, file_path, file_size = await self._generate_html_report(
-                    report_id, report_data, include_charts
+                    report_id, report_data, include_charts, persist
                 )
             elif format == "json":
                 content, file_path, file_size = await self._generate_json_report(
-                    report_id, report_data
+                    report_id, report_data, persist
                 )
             else:
                 raise ValueError(f"Unsupported format: {format}")
@@ -148,44 +272,66 @@ class ReportGenerator:
         """生成产品报告"""
 
         with get_db_session() as db:
-            # 获取产品
-            if product_ids:
-                products = (
-                    db.query(Product)
-                    .filter(Product.id.in_(product_ids), Product.tenant_id == tenant_id)
-                    .all()
+            # 获取产品（只加载报告章节用到的列，统计值由聚合查询提供）
+            product_query = db.query(Product).options(
+                load_only(
+                    Product.id,
+                    Product.asin,
+                    Product.title,
+                    Product.current_price,
+                    Product.current_rank,
+                    Product.current_rating,
                 )
+            )
+            if product_ids:
+                products = product_query.filter(
+                    Product.id.in_(product_ids), Product.tenant_id == tenant_id
+                ).all()
             else:
                 products = (
-                    db.query(Product)
-                    .filter(Product.tenant_id == tenant_id, Product.is_deleted == False)
+                    product_query.filter(
+                        Product.tenant_id == tenant_id, Product.is_deleted == False
+                    )
                     .limit(50)
                     .all()
                 )  # 限制最多50个产品
 
             if not products:
-                raise ValueError("No products found")
+                # 显式指定的产品全部不存在属于请求错误，租户尚无产品时才返回空报告
+                if product_ids:
+                    raise ValueError("No products found")
+                return self._create_empty_report("产品分析报告", "产品概览", time_period)
+
+            # 概览和总结统计由数据库一次聚合完成
+            aggregates = self._fetch_product_aggregates(
+                db, tenant_id, [p.id for p in products]
+            )
 
             sections = []
 
             # 产品概览章节
-            overview_section = await self._create_product_overview_section(products)
+            overview_section = await self._create_product_overview_section(aggregates)
             sections.append(overview_section)
 
-            # 价格分析章节
-            price_section = await self._create_price_analysis_section(
-                products, time_period, include_charts
+            # 价格/排名/评分数据一次遍历提取，供各分析章节共用
+            prices, ranks, ratings = _extract_product_values(products)
+
+            # 价格分析和排名分析章节（图表在线程中渲染，两者并发）
+            price_section, rank_section = await asyncio.gather(
+                self._create_price_analysis_section(
+                    prices, time_period, include_charts
+                ),
+                self._create_rank_analysis_section(
+                    ranks, len(products), time_period, include_charts
+                ),
             )
             sections.append(price_section)
-
-            # 排名分析章节
-            rank_section = await self._create_rank_analysis_section(
-                products, time_period, include_charts
-            )
             sections.append(rank_section)
 
             # 评分分析章节
-            rating_section = await self._create_rating_analysis_section(products)
+            rating_section = await self._create_rating_analysis_section(
+                ratings, len(products)
+            )
             sections.append(rating_section)
 
             # 详细产品信息章节
@@ -197,7 +343,7 @@ class ReportGenerator:
                 "title": f"产品分析报告 - {len(products)} 个产品",
                 "subtitle": f"分析周期: {time_period}",
                 "sections": sections,
-                "summary": self._create_product_summary(products),
+                "summary": self._create_product_summary(aggregates),
                 "metadata": {
                     "product_count": len(products),
                     "time_period": time_period,
@@ -206,6 +352,24 @@ class ReportGenerator:
             }
 
 
+    def _create_empty_report(
+        self, title: str, section_title: str, time_period: str
+    ) -> dict[str, Any]:
+        """创建无数据时的最小报告"""
+        return {
+            "title": title,
+            "subtitle": f"分析周期: {time_period}",
+            "sections": [
+                ReportSection(title=section_title, content="暂无数据", charts=[], data={})
+            ],
+            "summary": {},
+            "metadata": {
+                "product_count": 0,
+                "time_period": time_period,
+                "generated_at": datetime.utcnow().isoformat(),
+            },
+        }
+
     async def _generate_market_report(
         self, tenant_id: str, time_period: str, include_charts: bool
     ) -> dict[str, Any]:
@@ -218,8 +382,9 @@ class ReportGenerator:
             metrics=["price", "rank", "rating"],
         )
 
-        if "error" in market_analysis:
-            raise ValueError(market_analysis["error"])
+        # 没有符合条件的产品时直接返回空报告，不再构建各趋势章节
+        if "error" in market_analysis or not market_analysis.get("product_count"):
+            return self._create_empty_report("市场趋势分析报告", "市场概览", time_period)
 
         sections = []
 
@@ -238,17 +403,20 @@ class ReportGenerator:
         )
         sections.append(overview_section)
 
+        # 趋势章节直接使用分析器预先计算的期初/期末/变化汇总
+        trend_summary = market_analysis.get("trend_summary", {})
+
         # 价格趋势章节
         if "price" in market_analysis["trend_data"]:
             price_section = await self._create_market_price_section(
-                market_analysis["trend_data"]["price"], include_charts
+                trend_summary.get("price"), include_charts
             )
             sections.append(price_section)
 
         # 排名趋势章节
         if "rank" in market_analysis["trend_data"]:
             rank_section = await self._create_market_rank_section(
-                market_analysis["trend_data"]["rank"], include_charts
+                trend_summary.get("rank"), include_charts
             )
             sections.append(rank_section)
 
@@ -285,13 +453,12 @@ class ReportGenerator:
     ) -> dict[str, Any]:
         """生成综合报告"""
 
-        # 组合产品报告和市场报告
-        product_report = await self._generate_product_report(
-            tenant_id, product_ids, time_period, include_charts
-        )
-
-        market_report = await self._generate_market_report(
-            tenant_id, time_period, include_charts
+        # 组合产品报告和市场报告（两者使用各自的数据库会话，并发生成）
+        product_report, market_report = await asyncio.gather(
+            self._generate_product_report(
+                tenant_id, product_ids, time_period, include_charts
+            ),
+            self._generate_market_report(tenant_id, time_period, include_charts),
         )
 
         # 合并所有章节 (competitor analysis disabled)
@@ -313,25 +480,56 @@ class ReportGenerator:
             },
         }
 
+    def _fetch_product_aggregates(
+        self, db: Session, tenant_id: str, product_ids: list[int]
+    ) -> dict[str, Any]:
+        """在数据库中一次聚合产品数量、活跃数、平均价格和平均评分，并取前5个分类/品牌"""
+
+        product_filters = (Product.id.in_(product_ids), Product.tenant_id == tenant_id)
+
+        total_products, active_products, avg_price, avg_rating = (
+            db.query(
+                func.count(Product.id),
+                func.sum(case((Product.status == ProductStatus.ACTIVE, 1), else_=0)),
+                func.avg(Product.current_price),
+                func.avg(Product.current_rating),
+            )
+            .filter(*product_filters)
+            .one()
+        )
+
+        top_values = {}
+        for name, column in (
+            ("top_categories", Product.category),
+            ("top_brands", Product.brand),
+        ):
+            rows = (
+                db.query(column)
+                .filter(*product_filters, column.isnot(None), column != "")
+                .group_by(column)
+                .order_by(func.count(Product.id).desc())
+                .limit(5)
+                .all()
+            )
+            top_values[name] = [value for (value,) in rows]
+
+        return {
+            "total_products": total_products,
+            "active_products": int(active_products or 0),
+            "avg_price": float(avg_price) if avg_price is not None else None,
+            "avg_rating": float(avg_rating) if avg_rating is not None else None,
+            **top_values,
+        }
+
     async def _create_product_overview_section(
-        self, products: list[Product]
+        self, aggregates: dict[str, Any]
     ) -> ReportSection:
         """创建产品概览章节"""
 
-        total_products = len(products)
-        active_products = sum(1 for p in products if p.is_active)
-        avg_price = (
-            sum(p.current_price for p in products if p.current_price)
-            / len([p for p in products if p.current_price])
-            if any(p.current_price for p in products)
-            else 0
-        )
-        avg_rating = (
-            sum(p.rating for p in products if p.rating)
-            / len([p for p in products if p.rating])
-            if any(p.rating for p in products)
-            else 0
-        )
+        total_products = aggregates["total_products"]
+        active_products = aggregates["active_products"]
+        avg_price = aggregates["avg_price"] or 0
+        avg_rating = aggregates["avg_rating"] or 0
 
         content = f"""
 产品概览统计:
@@ -354,12 +552,10 @@ class ReportGenerator:
         )
 
     async def _create_price_analysis_section(
-        self, products: list[Product], time_period: str, include_charts: bool
+        self, prices: list[float], time_period: str, include_charts: bool
     ) -> ReportSection:
         """创建价格分析章节"""
 
-        prices = [p.current_price for p in products if p.current_price]
-
         if not prices:
             return ReportSection(
                 title="价格分析", content="无价格数据可供分析", charts=[], data={}
@@ -380,7 +576,9 @@ class ReportGenerator:
         charts = []
         if include_charts and VISUALIZATION_AVAILABLE:
             # 生成价格分布图
-            chart_data = self._create_price_distribution_chart(prices)
+            chart_data = await asyncio.to_thread(
+                self._create_price_distribution_chart, prices
+            )
             charts.append(chart_data)
 
         return ReportSection(
@@ -397,12 +595,14 @@ class ReportGenerator:
         )
 
     async def _create_rank_analysis_section(
-        self, products: list[Product], time_period: str, include_charts: bool
+        self,
+        ranks: list[int],
+        total_products: int,
+        time_period: str,
+        include_charts: bool,
     ) -> ReportSection:
         """创建排名分析章节"""
 
-        ranks = [p.current_rank for p in products if p.current_rank]
-
         if not ranks:
             return ReportSection(
                 title="排名分析", content="无排名数据可供分析", charts=[], data={}
@@ -417,13 +617,15 @@ class ReportGenerator:
 • 最佳排名: #{best_rank}
 • 最差排名: #{worst_rank}
 • 平均排名: #{avg_rank:.0f}
-• 排名产品数: {len(ranks)}/{len(products)}
+• 排名产品数: {len(ranks)}/{total_products}
         """.strip()
 
         charts = []
         if include_charts and VISUALIZATION_AVAILABLE:
             # 生成排名分布图
-            chart_data = self._create_rank_distribution_chart(ranks)
+            chart_data = await asyncio.to_thread(
+                self._create_rank_distribution_chart, ranks
+            )
             charts.append(chart_data)
 
         return ReportSection(
@@ -440,27 +642,30 @@ class ReportGenerator:
         )
 
     async def _create_rating_analysis_section(
-        self, products: list[Product]
+        self, ratings: list[float], total_products: int
     ) -> ReportSection:
         """创建评分分析章节"""
 
-        ratings = [p.rating for p in products if p.rating]
-
         if not ratings:
             return ReportSection(
                 title="评分分析", content="无评分数据可供分析", charts=[], data={}
             )
 
         avg_rating = sum(ratings) / len(ratings)
-        high_rated = sum(1 for r in ratings if r >= 4.0)
-        low_rated = sum(1 for r in ratings if r < 3.0)
+        high_rated = 0
+        low_rated = 0
+        for r in ratings:
+            if r >= 4.0:
+                high_rated += 1
+            elif r < 3.0:
+                low_rated += 1
 
         content = f"""
 评分分析:
 • 平均评分: {avg_rating:.2f}/5.0
 • 高评分产品 (≥4.0): {high_rated}
 • 低评分产品 (<3.0): {low_rated}
-• 有评分产品数: {len(ratings)}/{len(products)}
+• 有评分产品数: {len(ratings)}/{total_products}
         """.strip()
 
         return ReportSection(
@@ -482,12 +687,14 @@ class ReportGenerator:
         """创建产品详细信息章节"""
 
         content_lines = ["产品详细信息:\n"]
+        product_details = []
 
         for i, product in enumerate(products[:10], 1):  # 最多显示10个产品
-            price_str = (
-                f"${product.current_price:.2f}" if product.current_price else "N/A"
-            )
-            rating_str = f"{product.rating:.1f}/5.0" if product.rating else "N/A"
+            price = float(product.current_price) if product.current_price else None
+            rating = float(product.current_rating) if product.current_rating else None
+
+            price_str = f"${price:.2f}" if price else "N/A"
+            rating_str = f"{rating:.1f}/5.0" if rating else "N/A"
             rank_str = f"#{product.current_rank}" if product.current_rank else "N/A"
 
             content_lines.append(
@@ -495,105 +702,106 @@ class ReportGenerator:
                 f"   ASIN: {product.asin} | 价格: {price_str} | 评分: {rating_str} | 排名: {rank_str}\n"
             )
 
+            # 只导出报告用到的字段，避免序列化ORM内部状态和大字段
+            product_details.append(
+                {
+                    "asin": product.asin,
+                    "title": product.title,
+                    "current_price": price,
+                    "current_rating": rating,
+                    "current_rank": product.current_rank,
+                }
+            )
+
         return ReportSection(
             title="产品详细信息",
             content="\n".join(content_lines),
             charts=[],
-            data={"products": [p.__dict__ for p in products[:10]]},
+            data={"products": product_details},
         )
 
-    def _create_product_summary(self, products: list[Product]) -> dict[str, Any]:
+    def _create_product_summary(self, aggregates: dict[str, Any]) -> dict[str, Any]:
         """创建产品总结"""
 
         return {
-            "total_products": len(products),
-            "active_products": sum(1 for p in products if p.is_active),
-            "avg_price": sum(p.current_price for p in products if p.current_price)
-            / len([p for p in products if p.current_price])
-            if any(p.current_price for p in products)
-            else None,
-            "avg_rating": sum(p.rating for p in products if p.rating)
-            / len([p for p in products if p.rating])
-            if any(p.rating for p in products)
-            else None,
-            "top_categories": list(set(p.category for p in products if p.category))[:5],
-            "top_brands": list(set(p.brand for p in products if p.brand))[:5],
+            "total_products": aggregates["total_products"],
+            "active_products": aggregates["active_products"],
+            "avg_price": aggregates["avg_price"],
+            "avg_rating": aggregates["avg_rating"],
+            "top_categories": aggregates["top_categories"],
+            "top_brands": aggregates["top_brands"],
         }
 
-    def _create_price_distribution_chart(self, prices: list[float]) -> dict[str, Any]:
-        """创建价格分布图"""
+    def _get_chart_axes(self):
+        """获取当前线程专用的Figure和Axes（首次调用时创建）"""
+        local = self._chart_local
+        if not hasattr(local, "figure"):
+            local.figure = Figure(figsize=(10, 6))
+            FigureCanvasAgg(local.figure)
+            local.ax = local.figure.add_subplot(111)
+        return local.figure, local.ax
+
+    def _render_histogram(
+        self, values: list[float], title: str, xlabel: str, color: str
+    ) -> dict[str, Any]:
+        """在当前线程复用的Figure上绘制直方图并导出为PNG（CPU密集，应在线程中调用）"""
         if not VISUALIZATION_AVAILABLE:
             return {"error": "Visualization libraries not available"}
 
         try:
-            plt.figure(figsize=(10, 6))
-            plt.hist(prices, bins=20, alpha=0.7, color="blue")
-            plt.title("价格分布")
-            plt.xlabel("价格 ($)")
-            plt.ylabel("产品数量")
-            plt.grid(True, alpha=0.3)
-
-            # 保存图表为base64字符串
+            figure, ax = self._get_chart_axes()
+            ax.clear()
+            # 先用numpy计算分箱，再直接绘制柱形，跳过hist的容器构建开销
+            counts, edges = np.histogram(np.asarray(values, dtype=np.float64), bins=20)
+            ax.bar(
+                edges[:-1],
+                counts,
+                width=np.diff(edges),
+                align="edge",
+                alpha=0.7,
+                color=color,
+            )
+            ax.set_title(title)
+            ax.set_xlabel(xlabel)
+            ax.set_ylabel("产品数量")
+            ax.grid(True, alpha=0.3)
+
             buffer = io.BytesIO()
-            plt.savefig(buffer, format="png", dpi=150, bbox_inches="tight")
-            buffer.seek(0)
-            chart_base64 = base64.b64encode(buffer.getvalue()).decode()
-            plt.close()
+            figure.savefig(buffer, format="png", dpi=150, bbox_inches="tight")
 
+            # 保留原始PNG字节，base64仅在HTML/JSON输出时按需生成
             return {
                 "type": "histogram",
-                "title": "价格分布",
-                "data": chart_base64,
+                "title": title,
+                "png_bytes": buffer.getvalue(),
                 "format": "png",
             }
 
         except Exception as e:
             return {"error": f"Chart generation failed: {e}"}
 
+    def _create_price_distribution_chart(self, prices: list[float]) -> dict[str, Any]:
+        """创建价格分布图"""
+        return self._render_histogram(prices, "价格分布", "价格 ($)", "blue")
+
     def _create_rank_distribution_chart(self, ranks: list[int]) -> dict[str, Any]:
         """创建排名分布图"""
-        if not VISUALIZATION_AVAILABLE:
-            return {"error": "Visualization libraries not available"}
-
-        try:
-            plt.figure(figsize=(10, 6))
-            plt.hist(ranks, bins=20, alpha=0.7, color="green")
-            plt.title("排名分布")
-            plt.xlabel("排名")
-            plt.ylabel("产品数量")
-            plt.grid(True, alpha=0.3)
-
-            # 保存图表为base64字符串
-            buffer = io.BytesIO()
-            plt.savefig(buffer, format="png", dpi=150, bbox_inches="tight")
-            buffer.seek(0)
-            chart_base64 = base64.b64encode(buffer.getvalue()).decode()
-            plt.close()
-
-            return {
-                "type": "histogram",
-                "title": "排名分布",
-                "data": chart_base64,
-                "format": "png",
-            }
-
-        except Exception as e:
-            return {"error": f"Chart generation failed: {e}"}
-
+        return self._render_histogram(ranks, "排名分布", "排名", "green")
 
     async def _create_market_price_section(
-        self, price_data: list[dict], include_charts: bool
+        self, price_summary: Optional[dict[str, Any]], include_charts: bool
     ) -> ReportSection:
         """创建市场价格章节"""
 
-        if not price_data:
+        if not price_summary:
             return ReportSection(
                 title="市场价格趋势", content="无价格趋势数据", charts=[], data={}
             )
 
-        first_price = price_data[0]["value"]
-        last_price = price_data[-1]["value"]
-        change_percent = (last_price - first_price) / first_price * 100
+        first_price = price_summary["first"]
+        last_price = price_summary["last"]
+        change_percent = price_summary["change_percent"]
+        data_points = price_summary["data_points"]
 
         direction = (
             "上涨" if change_percent > 0 else "下跌" if change_percent < 0 else "稳定"
@@ -604,7 +812,7 @@ class ReportGenerator:
 • 期初平均价格: ${first_price:.2f}
 • 期末平均价格: ${last_price:.2f}
 • 变化幅度: {abs(change_percent):.1f}% ({direction})
-• 数据点数: {len(price_data)}
+• 数据点数: {data_points}
         """.strip()
 
         return ReportSection(
@@ -616,23 +824,24 @@ class ReportGenerator:
                 "last_price": last_price,
                 "change_percent": change_percent,
                 "direction": direction,
-                "data_points": len(price_data),
+                "data_points": data_points,
             },
         )
 
     async def _create_market_rank_section(
-        self, rank_data: list[dict], include_charts: bool
+        self, rank_summary: Optional[dict[str, Any]], include_charts: bool
     ) -> ReportSection:
         """创建市场排名章节"""
 
-        if not rank_data:
+        if not rank_summary:
             return ReportSection(
                 title="市场排名趋势", content="无排名趋势数据", charts=[], data={}
             )
 
-        first_rank = rank_data[0]["value"]
-        last_rank = rank_data[-1]["value"]
-        change_percent = (first_rank - last_rank) / first_rank * 100  # 排名降低是好事
+        first_rank = rank_summary["first"]
+        last_rank = rank_summary["last"]
+        change_percent = rank_summary["change_percent"]  # 排名降低为正向变化
+        data_points = rank_summary["data_points"]
 
         direction = (
             "改善" if change_percent > 0 else "下降" if change_percent < 0 else "稳定"
@@ -643,7 +852,7 @@ class ReportGenerator:
 • 期初平均排名: #{first_rank:.0f}
 • 期末平均排名: #{last_rank:.0f}
 • 变化幅度: {abs(change_percent):.1f}% ({direction})
-• 数据点数: {len(rank_data)}
+• 数据点数: {data_points}
         """.strip()
 
         return ReportSection(
@@ -655,35 +864,40 @@ class ReportGenerator:
                 "last_rank": last_rank,
                 "change_percent": change_percent,
                 "direction": direction,
-                "data_points": len(rank_data),
+                "data_points": data_points,
             },
         )
 
+    def _write_report_file(
+        self, report_id: str, extension: str, content: bytes
+    ) -> str:
+        """将报告内容写入临时目录，返回文件路径（阻塞IO，需在线程中调用）"""
+        file_path = f"/tmp/{report_id}.{extension}"
+        with open(file_path, "wb") as f:
+            f.write(content)
+        return file_path
+
     async def _generate_pdf_report(
-        self, report_id: str, report_data: dict[str, Any], include_charts: bool
+        self,
+        report_id: str,
+        report_data: dict[str, Any],
+        include_charts: bool,
+        persist: bool = False,
     ) -> tuple:
         """生成PDF报告"""
 
         if not PDF_AVAILABLE:
             raise ValueError("PDF generation libraries not available")
 
-        file_path = f"/tmp/{report_id}.pdf"
-
         try:
-            # 创建PDF文档
-            doc = SimpleDocTemplate(file_path, pagesize=A4)
-            styles = getSampleStyleSheet()
+            # 创建PDF文档（直接输出到内存）
+            buffer = io.BytesIO()
+            doc = SimpleDocTemplate(buffer, pagesize=A4)
+            styles = self._pdf_styles
             story = []
 
             # 标题
-            title_style = ParagraphStyle(
-                "CustomTitle",
-                parent=styles["Heading1"],
-                fontSize=18,
-                spaceAfter=30,
-                alignment=TA_CENTER,
-            )
-            story.append(Paragraph(report_data["title"], title_style))
+            story.append(Paragraph(report_data["title"], self._pdf_title_style))
 
             if report_data.get("subtitle"):
                 story.append(Paragraph(report_data["subtitle"], styles["Heading2"]))
@@ -696,24 +910,25 @@ class ReportGenerator:
                 story.append(Paragraph(section.title, styles["Heading2"]))
                 story.append(Spacer(1, 10))
 
-                # 章节内容
-                content_lines = section.content.split("\n")
-                for line in content_lines:
-                    if line.strip():
-                        story.append(Paragraph(line, styles["Normal"]))
+                # 章节内容：非空行合并为一个段落，用<br/>换行
+                content_markup = "<br/>".join(
+                    xml_escape(line)
+                    for line in section.content.split("\n")
+                    if line.strip()
+                )
+                if content_markup:
+                    story.append(Paragraph(content_markup, styles["Normal"]))
 
                 story.append(Spacer(1, 15))
 
                 # 添加图表（如果有）
                 for chart in section.charts:
-                    if chart.get("data") and not chart.get("error"):
+                    if chart.get("png_bytes") and not chart.get("error"):
                         try:
-                            # 解码base64图片
-                            image_data = base64.b64decode(chart["data"])
-                            image_buffer = io.BytesIO(image_data)
-
-                            # 添加图片到PDF
-                            img = Image(image_buffer, width=400, height=240)
+                            # 直接使用PNG字节添加图片到PDF
+                            img = Image(
+                                io.BytesIO(chart["png_bytes"]), width=400, height=240
+                            )
                             story.append(img)
                             story.append(Spacer(1, 10))
                         except Exception as e:
@@ -722,113 +937,82 @@ class ReportGenerator:
             # 生成PDF
             doc.build(story)
 
-            # 获取文件大小
-            import os
-
-            file_size = os.path.getsize(file_path)
-
-            # 读取文件内容
-            with open(file_path, "rb") as f:
-                content = f.read()
+            content = buffer.getvalue()
+            file_path = None
+            if persist:
+                file_path = await asyncio.to_thread(
+                    self._write_report_file, report_id, "pdf", content
+                )
 
-            return content, file_path, file_size
+            return content, file_path, len(content)
 
         except Exception as e:
             self.logger.error(f"PDF generation failed: {e}")
             raise
 
     async def _generate_html_report(
-        self, report_id: str, report_data: dict[str, Any], include_charts: bool
+        self,
+        report_id: str,
+        report_data: dict[str, Any],
+        include_charts: bool,
+        persist: bool = False,
     ) -> tuple:
         """生成HTML报告"""
 
-        html_template = """
-<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; }}
-        h1 {{ color: #333; text-align: center; }}
-        h2 {{ color: #666; border-bottom: 2px solid #ddd; padding-bottom: 10px; }}
-        .section {{ margin-bottom: 30px; }}
-        .chart {{ text-align: center; margin: 20px 0; }}
-        pre {{ background: #f4f4f4; padding: 15px; border-radius: 5px; }}
-        .summary {{ background: #f9f9f9; padding: 20px; border-radius: 5px; margin: 20px 0; }}
-    </style>
-</head>
-<body>
-    <h1>{title}</h1>
-    {subtitle}
-
-    {content}
-
-    <div class="summary">
-        <h2>报告总结</h2>
-        <pre>{summary}</pre>
-    </div>
-
-    <footer>
-        <p><small>生成时间: {generated_at}</small></p>
-    </footer>
-</body>
-</html>
-        """
-
-        # 构建内容
-        content_html = ""
+        # 构建内容：收集片段后一次拼接，避免循环中反复拼接字符串
+        parts = []
         for section in report_data["sections"]:
-            content_html += '<div class="section">\n'
-            content_html += f"<h2>{section.title}</h2>\n"
-            content_html += f"<pre>{section.content}</pre>\n"
+            parts.append('<div class="section">\n')
+            parts.append(f"<h2>{escape(section.title)}</h2>\n")
+            parts.append(f"<pre>{escape(section.content)}</pre>\n")
 
             # 添加图表
             for chart in section.charts:
-                if chart.get("data") and not chart.get("error"):
-                    content_html += '<div class="chart">\n'
-                    content_html += f'<img src="data:image/png;base64,{chart["data"]}" alt="{chart["title"]}" style="max-width: 100%;">\n'
-                    content_html += "</div>\n"
+                if chart.get("png_bytes") and not chart.get("error"):
+                    parts.append('<div class="chart">\n')
+                    parts.append(
+                        f'<img src="data:image/png;base64,{_chart_b64(chart)}" '
+                        f'alt="{escape(chart["title"])}" style="max-width: 100%;">\n'
+                    )
+                    parts.append("</div>\n")
+
+            parts.append("</div>\n")
 
-            content_html += "</div>\n"
+        subtitle = report_data.get("subtitle")
 
         # 生成HTML
-        html_content = html_template.format(
-            title=report_data["title"],
-            subtitle=f'<p style="text-align: center; color: #666;">{report_data.get("subtitle", "")}</p>'
-            if report_data.get("subtitle")
+        html_content = _HTML_REPORT_TEMPLATE.format(
+            title=escape(report_data["title"]),
+            subtitle=f'<p style="text-align: center; color: #666;">{escape(subtitle)}</p>'
+            if subtitle
             else "",
-            content=content_html,
-            summary=json.dumps(
-                report_data.get("summary", {}), indent=2, ensure_ascii=False
+            content="".join(parts),
+            summary=escape(
+                json.dumps(report_data.get("summary", {}), indent=2, ensure_ascii=False)
             ),
             generated_at=datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
         )
 
-        # 保存文件
-        file_path = f"/tmp/{report_id}.html"
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
-
-        file_size = len(html_content.encode("utf-8"))
+        html_bytes = html_content.encode("utf-8")
+        file_path = None
+        if persist:
+            file_path = await asyncio.to_thread(
+                self._write_report_file, report_id, "html", html_bytes
+            )
 
-        return html_content, file_path, file_size
+        return html_content, file_path, len(html_bytes)
 
     async def _generate_json_report(
-        self, report_id: str, report_data: dict[str, Any]
+        self, report_id: str, report_data: dict[str, Any], persist: bool = False
     ) -> tuple:
         """生成JSON报告"""
 
-        # 直接返回JSON数据
-        json_content = json.dumps(
-            report_data, indent=2, ensure_ascii=False, default=str
-        )
-
-        file_path = f"/tmp/{report_id}.json"
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(json_content)
-
-        file_size = len(json_content.encode("utf-8"))
+        # 直接生成UTF-8字节，长度即为文件大小
+        json_bytes = _dump_report_json(report_data)
+        file_path = None
+        if persist:
+            file_path = await asyncio.to_thread(
+                self._write_report_file, report_id, "json", json_bytes
+            )
 
-        return json_content, file_path, file_size
+        return json_bytes, file_path, len(json_bytes)
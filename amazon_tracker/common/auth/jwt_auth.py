@@ -1,33 +1,58 @@
 """JWT认证实现"""
 
+import hashlib
+import logging
 import os
 import secrets
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
-from uuid import uuid4
 
-# 加载环境变量
+import jwt
 from dotenv import load_dotenv
-
-project_root = Path(__file__).parent.parent.parent.parent
-load_dotenv(project_root / ".env.local")
-load_dotenv(project_root / ".env")
-
-from jose import jwt
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.orm import joinedload
 
-from ..database.base import get_db_session as get_direct_db_session
-from ..database.models import Tenant, User, UserSession
+from ..cache.redis_manager import cache_manager
+from ..database.base import session_scope
+from ..database.models import Role, User, UserRole, UserSession
 from .models import AuthUser, TokenData
 
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
+# 已验证令牌缓存的最大条目数
+TOKEN_CACHE_MAX_ENTRIES = 10_000
+
+# 用户角色/权限Redis缓存时间（秒），角色变更最多延迟该时间生效
+USER_ROLES_CACHE_TTL = 60
+
+# 当前用户信息Redis缓存时间（秒）
+AUTH_USER_CACHE_TTL = 30
+
+# 已吊销令牌黑名单键前缀（值在令牌原过期时间自动失效）
+TOKEN_BLACKLIST_PREFIX = "jwt:bl"
+
+# 待批量写入的会话活动时间（Redis有序集合: session_id -> 时间戳）
+SESSION_ACTIVITY_KEY = "amazon_tracker:session_activity"
+
 
 class JWTAuth:
     """JWT认证管理器"""
 
     def __init__(self):
-        self.secret_key = os.getenv("JWT_SECRET") or os.getenv("JWT_SECRET_KEY", self._generate_secret_key())
+        self.secret_key = (
+            os.getenv("JWT_SECRET")
+            or os.getenv("JWT_SECRET_KEY")
+            or self._generate_secret_key()
+        )
         self.algorithm = os.getenv("JWT_ALGORITHM", "HS256")
         self.access_token_expire_minutes = int(
             os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
@@ -35,6 +60,16 @@ class JWTAuth:
         self.refresh_token_expire_days = int(
             os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7")
         )
+        # 令牌有效期（秒），创建令牌时直接与时间戳相加
+        self._access_expire_seconds = int(
+            timedelta(minutes=self.access_token_expire_minutes).total_seconds()
+        )
+        self._refresh_expire_seconds = int(
+            timedelta(days=self.refresh_token_expire_days).total_seconds()
+        )
+        # 已验证令牌缓存: 令牌摘要 -> (TokenData, 过期时间戳)
+        self._token_cache: OrderedDict[bytes, tuple[TokenData, int]] = OrderedDict()
+        self._token_cache_lock = threading.Lock()
 
     def _generate_secret_key(self) -> str:
         """生成JWT密钥"""
@@ -44,15 +79,11 @@ class JWTAuth:
         self, user: User, session_id: str, expires_delta: Optional[timedelta] = None
     ) -> str:
         """创建访问令牌"""
+        now = int(time.time())
         if expires_delta:
-            expire = datetime.utcnow() + expires_delta
+            expire = now + int(expires_delta.total_seconds())
         else:
-            expire = datetime.utcnow() + timedelta(
-                minutes=self.access_token_expire_minutes
-            )
-
-        # 获取用户角色和权限
-        roles, permissions = self._get_user_permissions(user)
+            expire = now + self._access_expire_seconds
 
         # JWT payload
         to_encode = {
@@ -61,12 +92,10 @@ class JWTAuth:
             "username": user.username,
             "tenant_id": user.tenant_id,
             "is_super_admin": user.is_super_admin,
-            "roles": roles,
-            "permissions": permissions,
             "session_id": session_id,
             "exp": expire,
-            "iat": datetime.utcnow(),
-            "jti": str(uuid4()),  # JWT ID
+            "iat": now,
+            "jti": secrets.token_hex(16),  # JWT ID
             "type": "access",
         }
 
@@ -77,25 +106,53 @@ class JWTAuth:
         self, user: User, session_id: str, expires_delta: Optional[timedelta] = None
     ) -> str:
         """创建刷新令牌"""
+        now = int(time.time())
         if expires_delta:
-            expire = datetime.utcnow() + expires_delta
+            expire = now + int(expires_delta.total_seconds())
         else:
-            expire = datetime.utcnow() + timedelta(days=self.refresh_token_expire_days)
+            expire = now + self._refresh_expire_seconds
 
         to_encode = {
             "sub": str(user.id),
             "session_id": session_id,
             "exp": expire,
-            "iat": datetime.utcnow(),
-            "jti": str(uuid4()),
+            "iat": now,
+            "jti": secrets.token_hex(16),
             "type": "refresh",
         }
 
         encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
         return encoded_jwt
 
+    def _get_cached_token(self, key: bytes) -> Optional[TokenData]:
+        """从缓存读取未过期的已验证令牌"""
+        with self._token_cache_lock:
+            entry = self._token_cache.get(key)
+            if entry is None:
+                return None
+            token_data, expire = entry
+            if expire <= time.time():
+                del self._token_cache[key]
+                return None
+            self._token_cache.move_to_end(key)
+            return token_data
+
+    def _cache_token(self, key: bytes, token_data: TokenData) -> None:
+        """缓存已验证令牌，条目在令牌自身的exp时失效"""
+        with self._token_cache_lock:
+            self._token_cache[key] = (token_data, token_data.exp)
+            self._token_cache.move_to_end(key)
+            while len(self._token_cache) > TOKEN_CACHE_MAX_ENTRIES:
+                self._token_cache.popitem(last=False)
+
     def verify_token(self, token: str) -> Optional[TokenData]:
-        """验证并解析JWT令牌"""
+        """验证并解析JWT令牌（验证成功的结果会缓存至令牌过期）"""
+        cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        cached = self._get_cached_token(cache_key)
+        if cached is not None:
+            self._ensure_not_revoked(cached.jti)
+            return cached
+
         try:
             payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
 
@@ -109,21 +166,21 @@ class JWTAuth:
                 username=payload.get("username"),
                 tenant_id=payload.get("tenant_id"),
                 is_super_admin=payload.get("is_super_admin", False),
-                roles=payload.get("roles", []),
-                permissions=payload.get("permissions", []),
                 session_id=payload.get("session_id"),
-                exp=datetime.fromtimestamp(payload.get("exp")),
-                iat=datetime.fromtimestamp(payload.get("iat")),
+                exp=payload.get("exp"),
+                iat=payload.get("iat"),
                 jti=payload.get("jti"),
             )
 
+            self._ensure_not_revoked(token_data.jti)
+            self._cache_token(cache_key, token_data)
             return token_data
 
         except jwt.ExpiredSignatureError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has expired"
             )
-        except jwt.JWTError:
+        except jwt.InvalidTokenError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
             )
@@ -145,10 +202,10 @@ class JWTAuth:
             session_id = payload.get("session_id")
 
             # 验证会话是否还有效
-            db = get_direct_db_session()
-            try:
+            with session_scope() as db:
                 session = (
                     db.query(UserSession)
+                    .options(joinedload(UserSession.user))
                     .filter(
                         UserSession.session_id == session_id,
                         UserSession.is_active == True,
@@ -163,8 +220,8 @@ class JWTAuth:
                         detail="Session expired or invalid",
                     )
 
-                user = db.query(User).filter(User.id == user_id).first()
-                if not user:
+                user = session.user
+                if not user or user.id != user_id:
                     raise HTTPException(
                         status_code=status.HTTP_401_UNAUTHORIZED,
                         detail="User not found",
@@ -173,40 +230,69 @@ class JWTAuth:
                 # 创建新的访问令牌
                 new_access_token = self.create_access_token(user, session_id)
 
-                # 更新会话活动时间
-                session.last_activity_at = datetime.utcnow()
-                db.commit()
+                # 记录会话活动时间，由定时任务批量写回数据库
+                if not self._record_session_activity(session_id):
+                    session.last_activity_at = datetime.utcnow()
+                    db.commit()
 
                 return new_access_token
 
-            finally:
-                db.close()
-
         except jwt.ExpiredSignatureError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Refresh token has expired",
             )
-        except jwt.JWTError:
+        except jwt.InvalidTokenError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token"
             )
 
-    def invalidate_token(self, jti: str):
-        """使JWT令牌失效（通过将JTI加入黑名单）"""
-        # TODO: 实现JWT黑名单机制，可以使用Redis存储
-        pass
-
-    def _get_user_permissions(self, user: User) -> tuple[list[str], list[str]]:
-        """获取用户角色和权限"""
-        db = get_direct_db_session()
+    def _record_session_activity(self, session_id: str) -> bool:
+        """将会话活动时间写入Redis，失败时返回False以便调用方直接更新数据库"""
         try:
-            # 获取用户活跃的角色
-            from ..database.models import Role, UserRole
+            cache_manager.client.zadd(
+                SESSION_ACTIVITY_KEY, {str(session_id): time.time()}
+            )
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to record session activity in Redis: {e}")
+            return False
+
+    def invalidate_token(self, jti: str, exp: int) -> None:
+        """使JWT令牌失效（将JTI加入Redis黑名单，保留至令牌原过期时间）"""
+        ttl = max(1, exp - int(time.time()))
+        cache_manager.set(f"{TOKEN_BLACKLIST_PREFIX}:{jti}", 1, ttl=ttl)
+
+    def _ensure_not_revoked(self, jti: str) -> None:
+        """检查令牌是否已被吊销"""
+        if cache_manager.exists(f"{TOKEN_BLACKLIST_PREFIX}:{jti}"):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked"
+            )
+
+    def get_user_permissions(self, user_id: int) -> tuple[list[str], list[str]]:
+        """获取用户角色和权限（优先读取Redis缓存，未命中时一次性预加载角色与权限）
+
+        目前没有主动失效机制：角色分配或角色权限变更后，最多在
+        USER_ROLES_CACHE_TTL秒内仍返回旧的角色和权限。
+        """
+        cache_key = f"user:{user_id}:roles"
+        cached = cache_manager.get(cache_key)
+        if isinstance(cached, list) and len(cached) == 2:
+            return cached[0], cached[1]
 
+        roles, permissions = self._load_user_permissions(user_id)
+        cache_manager.set(cache_key, [roles, permissions], ttl=USER_ROLES_CACHE_TTL)
+        return roles, permissions
+
+    def _load_user_permissions(self, user_id: int) -> tuple[list[str], list[str]]:
+        """从数据库加载用户角色和权限（角色与权限一次性预加载，避免N+1查询）"""
+        with session_scope() as db:
+            # 获取用户活跃的角色
             user_roles = (
                 db.query(UserRole)
-                .filter(UserRole.user_id == user.id, UserRole.is_active == True)
+                .options(joinedload(UserRole.role).selectinload(Role.permissions))
+                .filter(UserRole.user_id == user_id, UserRole.is_active == True)
                 .all()
             )
 
@@ -217,7 +303,7 @@ class JWTAuth:
                 if user_role.is_expired():
                     continue
 
-                role = db.query(Role).filter(Role.id == user_role.role_id).first()
+                role = user_role.role
                 if role:
                     roles.append(role.name)
 
@@ -227,12 +313,15 @@ class JWTAuth:
 
             return roles, list(permissions)
 
-        finally:
-            db.close()
-
 
-# 全局JWT认证实例
-jwt_auth = JWTAuth()
+@lru_cache(maxsize=1)
+def get_jwt_auth() -> JWTAuth:
+    """获取全局JWT认证实例（首次调用时加载环境变量并创建）"""
+    # 生产环境的配置由部署环境变量注入，无需探测.env文件
+    if os.getenv("ENVIRONMENT", "development") != "production":
+        load_dotenv(_PROJECT_ROOT / ".env.local")
+        load_dotenv(_PROJECT_ROOT / ".env")
+    return JWTAuth()
 
 
 # 便捷函数
@@ -240,25 +329,43 @@ def create_access_token(
     user: User, session_id: str, expires_delta: Optional[timedelta] = None
 ) -> str:
     """创建访问令牌"""
-    return jwt_auth.create_access_token(user, session_id, expires_delta)
+    return get_jwt_auth().create_access_token(user, session_id, expires_delta)
 
 
 def verify_token(token: str) -> Optional[TokenData]:
     """验证JWT令牌"""
-    return jwt_auth.verify_token(token)
+    return get_jwt_auth().verify_token(token)
+
+
+async def get_current_user(token_data: TokenData) -> Optional[AuthUser]:
+    """根据令牌数据获取当前用户信息（数据库查询在线程池中执行）"""
+    return await run_in_threadpool(_load_current_user, token_data)
+
+
+def _auth_user_cache_key(user_id: int) -> str:
+    return f"authuser:{user_id}"
+
+
+def invalidate_current_user(user_id: int) -> None:
+    """使当前用户信息缓存失效（用户资料/状态变更后调用）"""
+    cache_manager.delete(_auth_user_cache_key(user_id))
 
 
-def get_current_user(token_data: TokenData) -> Optional[AuthUser]:
-    """根据令牌数据获取当前用户信息"""
-    db = get_direct_db_session()
-    try:
+def _load_current_user(token_data: TokenData) -> Optional[AuthUser]:
+    """加载当前用户信息（优先读取Redis缓存，角色和权限取自角色缓存）"""
+    cache_key = _auth_user_cache_key(token_data.user_id)
+    cached = cache_manager.get(cache_key)
+    if isinstance(cached, dict):
+        roles, permissions = get_jwt_auth().get_user_permissions(token_data.user_id)
+        return AuthUser(**cached, roles=roles, permissions=permissions)
+
+    with session_scope() as db:
         user = db.query(User).filter(User.id == token_data.user_id).first()
         if not user:
             return None
 
-        tenant = db.query(Tenant).filter(Tenant.tenant_id == user.tenant_id).first()
-
-        return AuthUser(
+        roles, permissions = get_jwt_auth().get_user_permissions(user.id)
+        auth_user = AuthUser(
             id=user.id,
             email=user.email,
             username=user.username,
@@ -267,32 +374,30 @@ def get_current_user(token_data: TokenData) -> Optional[AuthUser]:
             is_super_admin=user.is_super_admin,
             is_email_verified=user.is_email_verified,
             status=user.status.value,
-            roles=token_data.roles,
-            permissions=token_data.permissions,
+            roles=roles,
+            permissions=permissions,
             last_login_at=user.last_login_at,
             preferences=user.preferences or {},
         )
+        cache_manager.set(
+            cache_key,
+            auth_user.model_dump(mode="json", exclude={"roles", "permissions"}),
+            ttl=AUTH_USER_CACHE_TTL,
+        )
+        return auth_user
 
-    finally:
-        db.close()
+
+# 共享的Bearer认证方案实例（缺少或非Bearer的Authorization头由其直接拒绝）
+_http_bearer = HTTPBearer(bearerFormat="JWT", auto_error=True)
 
 
 # 创建一个简单的JWT认证依赖函数
-def jwt_bearer_dependency(authorization: HTTPAuthorizationCredentials = Depends(HTTPBearer())) -> TokenData:
+async def jwt_bearer_dependency(
+    authorization: HTTPAuthorizationCredentials = Depends(_http_bearer),
+) -> TokenData:
     """JWT Bearer认证依赖函数"""
-    if not authorization:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing authorization header"
-        )
-
-    if authorization.scheme != "Bearer":
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication scheme"
-        )
-
-    token_data = verify_token(authorization.credentials)
+    # 令牌解码与签名校验为CPU密集操作，放到线程池中执行
+    token_data = await run_in_threadpool(verify_token, authorization.credentials)
     if not token_data:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
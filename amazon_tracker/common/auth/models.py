@@ -1,5 +1,6 @@
 """认证相关数据模型和Pydantic Schema"""
 
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Optional
 from uuid import UUID
@@ -7,20 +8,20 @@ from uuid import UUID
 from pydantic import BaseModel, EmailStr, Field
 
 
-class TokenData(BaseModel):
-    """JWT Token数据结构"""
+@dataclass(slots=True, frozen=True)
+class TokenData:
+    """JWT Token数据结构（载荷已通过签名校验，无需再做Pydantic校验）"""
 
     user_id: int
     tenant_id: str
     email: str
-    username: Optional[str] = None
-    is_super_admin: bool = False
-    roles: list[str] = Field(default_factory=list)
-    permissions: list[str] = Field(default_factory=list)
     session_id: str
-    exp: datetime
-    iat: datetime
+    exp: int  # 过期时间（Unix时间戳）
+    iat: int  # 签发时间（Unix时间戳）
     jti: str  # JWT ID
+    username: Optional[str] = None
+    is_super_admin: bool = False
+    # 角色和权限不写入令牌，见AuthUser.roles/permissions（取自角色缓存）
 
 
 class AuthUser(BaseModel):
@@ -2,11 +2,27 @@
 
 from typing import Union
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 
 from .jwt_auth import JWTBearer, get_current_user
 from .models import AuthUser, TokenData
 
+# 所有检查器共享的JWT认证依赖
+_jwt_bearer = JWTBearer()
+
+
+async def _resolve_current_user(request: Request, token_data: TokenData) -> AuthUser:
+    """获取当前用户，同一请求内的多个检查器复用request.state中的结果"""
+    user = getattr(request.state, "auth_user", None)
+    if user is None:
+        user = await get_current_user(token_data)
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
+            )
+        request.state.auth_user = user
+    return user
+
 
 class PermissionChecker:
     """权限检查器"""
@@ -21,27 +37,23 @@ class PermissionChecker:
         """
         self.required_permissions = required_permissions
         self.require_all = require_all
+        self._required = frozenset(required_permissions)
 
     def check_permissions(self, user: AuthUser) -> bool:
         """检查用户是否有权限"""
         if user.is_super_admin:
             return True
 
-        user_permissions = set(user.permissions)
-        required_permissions = set(self.required_permissions)
-
         if self.require_all:
-            return required_permissions.issubset(user_permissions)
+            return self._required.issubset(user.permissions)
         else:
-            return bool(required_permissions.intersection(user_permissions))
+            return not self._required.isdisjoint(user.permissions)
 
-    def __call__(self, token_data: TokenData = Depends(JWTBearer())) -> AuthUser:
+    async def __call__(
+        self, request: Request, token_data: TokenData = Depends(_jwt_bearer)
+    ) -> AuthUser:
         """作为FastAPI依赖使用"""
-        user = get_current_user(token_data)
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
-            )
+        user = await _resolve_current_user(request, token_data)
 
         if not self.check_permissions(user):
             raise HTTPException(
@@ -64,27 +76,23 @@ class RoleChecker:
         """
         self.required_roles = required_roles
         self.require_all = require_all
+        self._required = frozenset(required_roles)
 
     def check_roles(self, user: AuthUser) -> bool:
         """检查用户是否有角色"""
         if user.is_super_admin:
             return True
 
-        user_roles = set(user.roles)
-        required_roles = set(self.required_roles)
-
         if self.require_all:
-            return required_roles.issubset(user_roles)
+            return self._required.issubset(user.roles)
         else:
-            return bool(required_roles.intersection(user_roles))
+            return not self._required.isdisjoint(user.roles)
 
-    def __call__(self, token_data: TokenData = Depends(JWTBearer())) -> AuthUser:
+    async def __call__(
+        self, request: Request, token_data: TokenData = Depends(_jwt_bearer)
+    ) -> AuthUser:
         """作为FastAPI依赖使用"""
-        user = get_current_user(token_data)
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
-            )
+        user = await _resolve_current_user(request, token_data)
 
         if not self.check_roles(user):
             raise HTTPException(
@@ -114,15 +122,11 @@ class TenantChecker:
 
         return user.tenant_id == target_tenant_id
 
-    def __call__(self, token_data: TokenData = Depends(JWTBearer())) -> AuthUser:
+    async def __call__(
+        self, request: Request, token_data: TokenData = Depends(_jwt_bearer)
+    ) -> AuthUser:
         """作为FastAPI依赖使用"""
-        user = get_current_user(token_data)
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
-            )
-
-        return user
+        return await _resolve_current_user(request, token_data)
 
 
 def require_permission(
@@ -202,12 +206,10 @@ def require_super_admin() -> RoleChecker:
         RoleChecker实例
     """
 
-    def super_admin_checker(token_data: TokenData = Depends(JWTBearer())) -> AuthUser:
-        user = get_current_user(token_data)
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
-            )
+    async def super_admin_checker(
+        request: Request, token_data: TokenData = Depends(_jwt_bearer)
+    ) -> AuthUser:
+        user = await _resolve_current_user(request, token_data)
 
         if not user.is_super_admin:
             raise HTTPException(
@@ -1,74 +1,244 @@
 """Redis缓存管理器"""
 
+import asyncio
+import hashlib
+import inspect
 import json
 import logging
-from collections.abc import Callable
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from functools import wraps
-from typing import Any, Optional, Union
+from typing import Any, ClassVar, Optional, Union, cast
 
 import redis
 from redis import Redis
+from redis.asyncio import BlockingConnectionPool as AsyncBlockingConnectionPool
+from redis.asyncio import Redis as AsyncRedis
+from redis.client import Pipeline
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 from ..config.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
+# clear_pattern每次SCAN的提示数量与每条DELETE命令的键数
+CLEAR_PATTERN_SCAN_COUNT = 10_000
+CLEAR_PATTERN_DELETE_BATCH = 500
+
+
+def _json_default(obj: Any) -> Any:
+    """无法原生编码的对象：numpy标量/数组还原为Python数值或列表，其余转为字符串"""
+    if type(obj).__module__ == "numpy" and hasattr(obj, "tolist"):
+        return obj.tolist()
+    return str(obj)
+
+
+def _json_dumps_bytes(data: Any, sort_keys: bool = False) -> bytes:
+    """JSON序列化为UTF-8字节（优先使用orjson，未安装时退回标准库json）"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(data, default=_json_default, option=option)
+    return json.dumps(
+        data, ensure_ascii=False, default=_json_default, sort_keys=sort_keys
+    ).encode()
+
+
+def _stable_key(payload: bytes) -> str:
+    """生成跨进程稳定的缓存键摘要
+
+    内置hash()受PYTHONHASHSEED随机化影响，不同进程对相同输入会得到不同结果。
+    """
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _json_loads(data: Union[str, bytes]) -> Any:
+    """JSON反序列化（优先使用orjson）"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class _PrefixedCache:
+    """绑定固定键前缀的轻量缓存视图
+
+    前缀预先编码为字节，单键操作直接拼接字节键，省去逐次的f-string格式化和
+    redis-py内部的键编码。
+    """
+
+    __slots__ = ("_prefix", "_cache")
+
+    def __init__(self, prefix: str, cache: "RedisCache"):
+        self._prefix = f"{prefix}:".encode()
+        self._cache = cache
+
+    def _key(self, key: str) -> bytes:
+        return self._prefix + key.encode()
+
+    def set(self, key: str, value: Any, ttl: int) -> bool:
+        """设置缓存"""
+        try:
+            return bool(
+                self._cache.client.setex(
+                    self._key(key), ttl, self._cache._serialize(value)
+                )
+            )
+        except Exception as e:
+            logger.error(f"Failed to set cache {key}: {e}")
+            return False
+
+    def get(self, key: str) -> Any:
+        """获取缓存，不存在时返回None"""
+        try:
+            value = self._cache.client.get(self._key(key))
+            return None if value is None else self._cache._deserialize(value)
+        except Exception as e:
+            logger.error(f"Failed to get cache {key}: {e}")
+            return None
+
 
 class RedisCache:
     """Redis缓存管理器"""
 
+    # 缓存时间配置（秒）
+    TTL_30_MINUTES: ClassVar[int] = 30 * 60
+    TTL_2_HOURS: ClassVar[int] = 2 * 60 * 60
+    TTL_6_HOURS: ClassVar[int] = 6 * 60 * 60
+    TTL_24_HOURS: ClassVar[int] = 24 * 60 * 60
+    TTL_48_HOURS: ClassVar[int] = 48 * 60 * 60
+    TTL_7_DAYS: ClassVar[int] = 7 * 24 * 60 * 60
+
     def __init__(self, redis_url: Optional[str] = None):
         settings = get_settings()
         self.redis_url = redis_url or settings.REDIS_URL
+        # 有界阻塞连接池：并发请求复用连接，连接耗尽时等待而不是无限新建
+        self._pool = redis.BlockingConnectionPool.from_url(
+            self.redis_url,
+            max_connections=settings.REDIS_POOL_MAX,
+            timeout=settings.REDIS_POOL_TIMEOUT,
+            # 缓存值以UTF-8 JSON字节直接读写，省去客户端的字符串编解码
+            decode_responses=False,
+            socket_connect_timeout=5,
+            socket_timeout=5,
+        )
         self._client: Optional[Redis] = None
+        self._pool_max = settings.REDIS_POOL_MAX
+        self._pool_timeout = settings.REDIS_POOL_TIMEOUT
+        # 异步客户端绑定创建它的事件循环，循环变化时重建
+        self._async_client: Optional[AsyncRedis] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
 
-        # 缓存时间配置（秒）
-        self.TTL_30_MINUTES = 30 * 60
-        self.TTL_2_HOURS = 2 * 60 * 60
-        self.TTL_6_HOURS = 6 * 60 * 60
-        self.TTL_24_HOURS = 24 * 60 * 60
-        self.TTL_48_HOURS = 48 * 60 * 60
-        self.TTL_7_DAYS = 7 * 24 * 60 * 60
+        # 常用前缀的绑定视图
+        self.products = _PrefixedCache("products", self)
 
     @property
     def client(self) -> Redis:
-        """获取Redis客户端"""
+        """获取Redis客户端
+
+        不再预先ping：连接由连接池在首个实际命令时建立，连接错误随该命令抛出
+        并由各缓存方法记录日志，避免冷启动时多一次网络往返。
+        """
         if self._client is None:
-            try:
-                self._client = redis.from_url(
-                    self.redis_url,
-                    decode_responses=True,
-                    socket_connect_timeout=5,
-                    socket_timeout=5,
-                )
-                # 测试连接
-                self._client.ping()
-                logger.info("Redis connection established successfully")
-            except Exception as e:
-                logger.error(f"Failed to connect to Redis: {e}")
-                raise
+            self._client = Redis(connection_pool=self._pool)
         return self._client
 
-    def _serialize(self, data: Any) -> str:
-        """序列化数据"""
+    @property
+    def async_client(self) -> AsyncRedis:
+        """获取当前事件循环的异步Redis客户端（须在协程中访问）"""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            self._release_async_client()
+            # 与同步客户端相同的有界阻塞连接池
+            pool = AsyncBlockingConnectionPool.from_url(
+                self.redis_url,
+                max_connections=self._pool_max,
+                timeout=self._pool_timeout,
+                decode_responses=False,
+                socket_connect_timeout=5,
+                socket_timeout=5,
+            )
+            self._async_client = AsyncRedis(connection_pool=pool)
+            self._async_loop = loop
+        return self._async_client
+
+    def _release_async_client(self) -> None:
+        """释放绑定在旧事件循环上的异步客户端及其连接池"""
+        old_client, old_loop = self._async_client, self._async_loop
+        self._async_client = None
+        self._async_loop = None
+        if old_client is None:
+            return
+
+        if old_loop is not None and old_loop.is_running():
+            # 连接只能在所属循环中关闭
+            asyncio.run_coroutine_threadsafe(
+                old_client.aclose(close_connection_pool=True), old_loop
+            )
+        else:
+            # 旧循环已停止，无法再执行协程：丢弃连接引用，套接字随对象回收关闭
+            old_client.connection_pool.reset()
+
+    async def aget(self, key: str, prefix: str = "amazon_tracker") -> Any:
+        """异步获取缓存，不存在时返回None"""
+        try:
+            full_key = f"{prefix}:{key}"
+            value = await self.async_client.get(full_key)
+
+            if value is None:
+                logger.debug(f"Cache miss: {full_key}")
+                return None
+
+            logger.debug(f"Cache hit: {full_key}")
+            return self._deserialize(value)
+
+        except Exception as e:
+            logger.error(f"Failed to get cache {key}: {e}")
+            return None
+
+    async def aset(
+        self, key: str, value: Any, ttl: int = None, prefix: str = "amazon_tracker"
+    ) -> bool:
+        """异步设置缓存，ttl默认24小时"""
         try:
-            if isinstance(data, (dict, list, tuple)):
-                return json.dumps(data, ensure_ascii=False, default=str)
-            elif isinstance(data, (int, float, str, bool)):
-                return str(data)
-            else:
-                return json.dumps(data, ensure_ascii=False, default=str)
+            full_key = f"{prefix}:{key}"
+            ttl = ttl or self.TTL_24_HOURS
+            result = await self.async_client.setex(
+                full_key, ttl, self._serialize(value)
+            )
+
+            if result:
+                logger.debug(f"Cache set: {full_key} (TTL: {ttl}s)")
+            return bool(result)
+
+        except Exception as e:
+            logger.error(f"Failed to set cache {key}: {e}")
+            return False
+
+    def _serialize(self, data: Any) -> bytes:
+        """序列化数据（标量同样编码为JSON，读取时可还原原始类型）"""
+        try:
+            return _json_dumps_bytes(data)
         except Exception as e:
             logger.error(f"Failed to serialize data: {e}")
-            return str(data)
+            return str(data).encode()
 
-    def _deserialize(self, data: str) -> Any:
+    def _deserialize(self, data: Union[str, bytes]) -> Any:
         """反序列化数据"""
         try:
-            # 尝试解析为JSON
-            return json.loads(data)
-        except (json.JSONDecodeError, TypeError):
-            # 如果不是JSON，返回原始字符串
+            # 尝试解析为JSON（orjson.JSONDecodeError是json.JSONDecodeError的子类）
+            return _json_loads(data)
+        except (json.JSONDecodeError, UnicodeDecodeError, TypeError):
+            # 如果不是JSON（如旧版本写入的纯字符串），返回原始字符串
+            if isinstance(data, bytes):
+                return data.decode(errors="replace")
             return data
 
     def set(
@@ -125,6 +295,66 @@ class RedisCache:
             logger.error(f"Failed to get cache {key}: {e}")
             return None
 
+    def mset(
+        self, items: dict[str, Any], ttl: int = None, prefix: str = "amazon_tracker"
+    ) -> bool:
+        """批量设置缓存（单次往返的管道SETEX）
+
+        Args:
+            items: 缓存键到缓存值的映射
+            ttl: 过期时间（秒），默认24小时
+            prefix: 键前缀
+
+        Returns:
+            是否全部设置成功
+        """
+        if not items:
+            return True
+        try:
+            ttl = ttl or self.TTL_24_HOURS
+            with self.pipeline() as pipe:
+                for key, value in items.items():
+                    pipe.setex(f"{prefix}:{key}", ttl, self._serialize(value))
+                results = pipe.execute()
+
+            logger.debug(f"Cache mset: {len(items)} keys with prefix {prefix}")
+            return all(results)
+
+        except Exception as e:
+            logger.error(f"Failed to mset {len(items)} cache keys: {e}")
+            return False
+
+    def mget(self, keys: list[str], prefix: str = "amazon_tracker") -> list[Any]:
+        """批量获取缓存
+
+        Args:
+            keys: 缓存键列表
+            prefix: 键前缀
+
+        Returns:
+            与keys顺序一致的缓存值列表，不存在的键对应None
+        """
+        if not keys:
+            return []
+        try:
+            values = self.client.mget([f"{prefix}:{key}" for key in keys])
+            return [
+                None if value is None else self._deserialize(value)
+                for value in values
+            ]
+        except Exception as e:
+            logger.error(f"Failed to mget {len(keys)} cache keys: {e}")
+            return [None] * len(keys)
+
+    @contextmanager
+    def pipeline(self) -> Iterator[Pipeline]:
+        """获取非事务管道，批量发送命令以减少网络往返"""
+        pipe = self.client.pipeline(transaction=False)
+        try:
+            yield pipe
+        finally:
+            pipe.reset()
+
     def delete(self, key: str, prefix: str = "amazon_tracker") -> bool:
         """删除缓存
 
@@ -147,6 +377,23 @@ class RedisCache:
             logger.error(f"Failed to delete cache {key}: {e}")
             return False
 
+    def incr(self, key: str, prefix: str = "amazon_tracker") -> Optional[int]:
+        """原子递增计数器
+
+        Args:
+            key: 缓存键
+            prefix: 键前缀
+
+        Returns:
+            递增后的值，失败时返回None
+        """
+        try:
+            full_key = f"{prefix}:{key}"
+            return self.client.incr(full_key)
+        except Exception as e:
+            logger.error(f"Failed to increment cache {key}: {e}")
+            return None
+
     def exists(self, key: str, prefix: str = "amazon_tracker") -> bool:
         """检查缓存是否存在
 
@@ -193,13 +440,25 @@ class RedisCache:
         """
         try:
             full_pattern = f"{prefix}:{pattern}"
-            keys = self.client.keys(full_pattern)
-
-            if keys:
-                deleted = self.client.delete(*keys)
+            client = self.client
+            deleted = 0
+            batch: list[bytes] = []
+
+            # SCAN增量遍历，避免KEYS阻塞Redis；每满一批立即UNLINK（后台释放内存），
+            # 客户端只保留当前批次的键
+            for key in client.scan_iter(
+                match=full_pattern, count=CLEAR_PATTERN_SCAN_COUNT
+            ):
+                batch.append(key)
+                if len(batch) >= CLEAR_PATTERN_DELETE_BATCH:
+                    deleted += client.unlink(*batch)
+                    batch.clear()
+            if batch:
+                deleted += client.unlink(*batch)
+
+            if deleted:
                 logger.info(f"Deleted {deleted} keys matching pattern: {full_pattern}")
-                return deleted
-            return 0
+            return deleted
 
         except Exception as e:
             logger.error(f"Failed to clear pattern {pattern}: {e}")
@@ -207,21 +466,27 @@ class RedisCache:
 
     # 专门的缓存方法
     def cache_product_data(
-        self, product_id: Union[int, str], data: dict[str, Any], ttl: int = None
+        self,
+        product_id: Union[int, str, list[tuple[Union[int, str], dict[str, Any]]]],
+        data: Optional[dict[str, Any]] = None,
+        ttl: int = None,
     ) -> bool:
         """缓存产品数据
 
         Args:
-            product_id: 产品ID
-            data: 产品数据
+            product_id: 产品ID，或(产品ID, 产品数据)列表用于批量缓存
+            data: 产品数据（批量缓存时忽略）
             ttl: 过期时间，默认24小时
 
         Returns:
             是否缓存成功
         """
-        key = f"product:{product_id}"
         ttl = ttl or self.TTL_24_HOURS
-        return self.set(key, data, ttl, prefix="products")
+        if isinstance(product_id, list):
+            items = {f"product:{pid}": item for pid, item in product_id}
+            return self.mset(items, ttl, prefix="products")
+
+        return self.products.set(f"product:{product_id}", data, ttl)
 
     def get_product_data(self, product_id: Union[int, str]) -> Optional[dict[str, Any]]:
         """获取产品数据缓存
@@ -232,8 +497,7 @@ class RedisCache:
         Returns:
             产品数据或None
         """
-        key = f"product:{product_id}"
-        return self.get(key, prefix="products")
+        return self.products.get(f"product:{product_id}")
 
     def cache_analysis_report(
         self, report_id: str, data: dict[str, Any], ttl: int = None
@@ -252,6 +516,20 @@ class RedisCache:
         ttl = ttl or self.TTL_48_HOURS
         return self.set(key, data, ttl, prefix="reports")
 
+    def get_products_data(
+        self, product_ids: list[Union[int, str]]
+    ) -> list[Optional[dict[str, Any]]]:
+        """批量获取产品数据缓存
+
+        Args:
+            product_ids: 产品ID列表
+
+        Returns:
+            与product_ids顺序一致的产品数据列表，未命中为None
+        """
+        keys = [f"product:{product_id}" for product_id in product_ids]
+        return self.mget(keys, prefix="products")
+
     def get_analysis_report(self, report_id: str) -> Optional[dict[str, Any]]:
         """获取分析报告缓存
 
@@ -264,6 +542,12 @@ class RedisCache:
         key = f"report:{report_id}"
         return self.get(key, prefix="reports")
 
+    @staticmethod
+    def _api_key(endpoint: str, params: dict[str, Any]) -> str:
+        """生成API响应缓存键（参数按键排序后直接以字节求摘要）"""
+        params_bytes = _json_dumps_bytes(params, sort_keys=True)
+        return f"api:{endpoint}:{_stable_key(params_bytes)}"
+
     def cache_api_response(
         self, endpoint: str, params: dict[str, Any], response: Any, ttl: int = None
     ) -> bool:
@@ -278,9 +562,7 @@ class RedisCache:
         Returns:
             是否缓存成功
         """
-        # 创建缓存键
-        params_str = json.dumps(params, sort_keys=True, ensure_ascii=False)
-        key = f"api:{endpoint}:{hash(params_str)}"
+        key = self._api_key(endpoint, params)
         ttl = ttl or self.TTL_30_MINUTES
         return self.set(key, response, ttl, prefix="api_cache")
 
@@ -294,37 +576,62 @@ class RedisCache:
         Returns:
             缓存的响应数据或None
         """
-        params_str = json.dumps(params, sort_keys=True, ensure_ascii=False)
-        key = f"api:{endpoint}:{hash(params_str)}"
+        key = self._api_key(endpoint, params)
         return self.get(key, prefix="api_cache")
 
     def cache_stats(self) -> dict[str, Any]:
         """获取缓存统计信息"""
         try:
-            info = self.client.info()
+            # 只取需要的INFO分段（单次往返），避免解析完整INFO输出
+            with self.pipeline() as pipe:
+                pipe.info("clients")
+                pipe.info("memory")
+                pipe.info("stats")
+                clients, memory, stats = pipe.execute()
+
+            hits = stats.get("keyspace_hits", 0)
+            misses = stats.get("keyspace_misses", 0)
             return {
-                "connected_clients": info.get("connected_clients", 0),
-                "used_memory": info.get("used_memory", 0),
-                "used_memory_human": info.get("used_memory_human", "0B"),
-                "keyspace_hits": info.get("keyspace_hits", 0),
-                "keyspace_misses": info.get("keyspace_misses", 0),
-                "hit_rate": info.get("keyspace_hits", 0)
-                / max(info.get("keyspace_hits", 0) + info.get("keyspace_misses", 0), 1)
-                * 100,
+                "connected_clients": clients.get("connected_clients", 0),
+                "used_memory": memory.get("used_memory", 0),
+                "used_memory_human": memory.get("used_memory_human", "0B"),
+                "keyspace_hits": hits,
+                "keyspace_misses": misses,
+                "hit_rate": hits / ((hits + misses) or 1) * 100,
             }
         except Exception as e:
             logger.error(f"Failed to get cache stats: {e}")
             return {}
 
 
-# 单例实例
-cache_manager = RedisCache()
+class _LazyRedisCache:
+    """RedisCache延迟代理：首次访问属性时才读取配置并创建实例"""
+
+    __slots__ = ("_instance", "_lock")
+
+    def __init__(self):
+        self._instance: Optional[RedisCache] = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = RedisCache()
+                instance = self._instance
+        return getattr(instance, name)
+
+
+# 单例实例（延迟创建，仅导入本模块不会加载配置）
+cache_manager = cast(RedisCache, _LazyRedisCache())
 
 
 def cache_result(
     ttl: int = 30 * 60,
     prefix: str = "func_cache",
     key_generator: Optional[Callable] = None,
+    should_cache: Optional[Callable[[Any], bool]] = None,
 ):
     """缓存函数结果的装饰器
 
@@ -332,61 +639,66 @@ def cache_result(
         ttl: 缓存时间（秒）
         prefix: 缓存键前缀
         key_generator: 自定义键生成函数
+        should_cache: 判断结果是否写入缓存的函数（如跳过错误结果），默认全部缓存
     """
 
     def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            # 生成缓存键
+        func_name = func.__name__
+        # 方法的self/cls序列化后包含对象内存地址，不能参与键计算，
+        # 否则不同实例、不同进程的键永远不一致
+        params = list(inspect.signature(func).parameters)
+        skip_first = bool(params) and params[0] in ("self", "cls")
+
+        def make_key(args: tuple, kwargs: dict) -> str:
+            """生成缓存键"""
             if key_generator:
-                cache_key = key_generator(*args, **kwargs)
-            else:
-                args_str = json.dumps(args, sort_keys=True, default=str)
-                kwargs_str = json.dumps(kwargs, sort_keys=True, default=str)
-                cache_key = f"{func.__name__}:{hash(args_str + kwargs_str)}"
+                return key_generator(*args, **kwargs)
+            key_args = args[1:] if skip_first else args
+            payload = _json_dumps_bytes(key_args, sort_keys=True) + _json_dumps_bytes(
+                kwargs, sort_keys=True
+            )
+            return f"{func_name}:{_stable_key(payload)}"
 
-            # 尝试从缓存获取
-            cached_result = cache_manager.get(cache_key, prefix)
-            if cached_result is not None:
-                logger.debug(f"Cache hit for {func.__name__}")
-                return cached_result
+        if asyncio.iscoroutinefunction(func):
 
-            # 执行函数并缓存结果
-            result = await func(*args, **kwargs)
-            cache_manager.set(cache_key, result, ttl, prefix)
-            logger.debug(f"Cache set for {func.__name__}")
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                cache_key = make_key(args, kwargs)
 
-            return result
+                # 尝试从缓存获取
+                cached_result = await cache_manager.aget(cache_key, prefix)
+                if cached_result is not None:
+                    logger.debug(f"Cache hit for {func_name}")
+                    return cached_result
+
+                # 执行函数并缓存结果
+                result = await func(*args, **kwargs)
+                if should_cache is None or should_cache(result):
+                    await cache_manager.aset(cache_key, result, ttl, prefix)
+                    logger.debug(f"Cache set for {func_name}")
+
+                return result
+
+            return async_wrapper
 
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
-            # 生成缓存键
-            if key_generator:
-                cache_key = key_generator(*args, **kwargs)
-            else:
-                args_str = json.dumps(args, sort_keys=True, default=str)
-                kwargs_str = json.dumps(kwargs, sort_keys=True, default=str)
-                cache_key = f"{func.__name__}:{hash(args_str + kwargs_str)}"
+            cache_key = make_key(args, kwargs)
 
             # 尝试从缓存获取
             cached_result = cache_manager.get(cache_key, prefix)
             if cached_result is not None:
-                logger.debug(f"Cache hit for {func.__name__}")
+                logger.debug(f"Cache hit for {func_name}")
                 return cached_result
 
             # 执行函数并缓存结果
             result = func(*args, **kwargs)
-            cache_manager.set(cache_key, result, ttl, prefix)
-            logger.debug(f"Cache set for {func.__name__}")
+            if should_cache is None or should_cache(result):
+                cache_manager.set(cache_key, result, ttl, prefix)
+                logger.debug(f"Cache set for {func_name}")
 
             return result
 
-        # 检查是否是异步函数
-        import asyncio
-
-        if asyncio.iscoroutinefunction(func):
-            return async_wrapper
-        else:
-            return sync_wrapper
+        return sync_wrapper
 
     return decorator
@@ -1,6 +1,6 @@
 """应用程序配置设置"""
 
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from typing import Optional
 
 try:
@@ -25,6 +25,7 @@ class Settings(BaseSettings):
         class Config:
             env_file = ".env.local"
             extra = "ignore"
+            keep_untouched = (cached_property,)
 
     # ===== 基础配置 =====
     APP_NAME: str = "Amazon产品追踪分析系统"
@@ -42,6 +43,10 @@ class Settings(BaseSettings):
     REDIS_URL: str = Field(
         default="redis://localhost:6379/0", description="Redis连接URL"
     )
+    REDIS_POOL_MAX: int = Field(default=50, description="Redis连接池最大连接数")
+    REDIS_POOL_TIMEOUT: int = Field(
+        default=10, description="等待空闲Redis连接的超时时间（秒）"
+    )
 
     # ===== 认证配置 =====
     JWT_SECRET: str = Field(
@@ -124,9 +129,9 @@ class Settings(BaseSettings):
     RELOAD: bool = False
     WORKERS: int = 4
 
-    @property
+    @cached_property
     def cors_origins_list(self) -> list[str]:
-        """CORS允许的源列表"""
+        """CORS允许的源列表（首次访问时解析并缓存）"""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
 
 
@@ -4,9 +4,11 @@ import asyncio
 import json
 import logging
 import os
+import uuid
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
 # 加载环境变量
 from dotenv import load_dotenv
@@ -21,6 +23,19 @@ from .base import AmazonProductData, BaseCrawler, CrawlerError, CrawlerResult
 
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=8192)
+def _extract_asin_from_url(url: str) -> Optional[str]:
+    """从产品URL（.../dp/<ASIN>/...）中提取ASIN，相同URL直接命中缓存"""
+    parts = url.split("/")
+    for i, part in enumerate(parts):
+        if part == "dp" and i + 1 < len(parts):
+            asin = parts[i + 1]
+            if len(asin) == 10:
+                return asin
+    return None
+
+
 class DateTimeEncoder(json.JSONEncoder):
     def default(self, obj):
         if isinstance(obj, datetime):
@@ -116,6 +131,8 @@ class ApifyAmazonScraper(BaseCrawler):
             "memory_mb": 4096,
             "max_retries": 3,
             "actor_id": self.AMAZON_ASIN_SCRAPER,  # 默认使用ASIN爬虫
+            "batch_size": 25,  # 批量爬取时每个Actor运行处理的ASIN数
+            "max_concurrent_batches": 4,  # 同时运行的Actor数量上限
         }
         self.default_config.update(config or {})
 
@@ -145,26 +162,22 @@ class ApifyAmazonScraper(BaseCrawler):
     def preprocess_input(self, input_data: dict[str, Any]) -> dict[str, Any]:
         """预处理输入数据为Apify ASIN爬虫格式"""
 
-        processed = {
-            "asins": input_data.get("asins", []),
-            "amazonDomain": "amazon.com",  # 固定使用amazon.com
-            "proxyCountry": "AUTO_SELECT_PROXY_COUNTRY",
-            "useCaptchaSolver": False,
-        }
+        # 用dict收集ASIN：保持输入顺序并在收集时去重，避免重复爬取同一产品
+        asins = dict.fromkeys(input_data.get("asins", []))
 
         # 如果有productUrls，提取ASIN
         if input_data.get("productUrls"):
             for url in input_data["productUrls"]:
-                # 简单的ASIN提取逻辑
-                parts = url.split("/")
-                for i, part in enumerate(parts):
-                    if part == "dp" and i + 1 < len(parts):
-                        asin = parts[i + 1]
-                        if len(asin) == 10:
-                            processed["asins"].append(asin)
+                asin = _extract_asin_from_url(url)
+                if asin:
+                    asins.setdefault(asin)
 
-        # 移除重复的ASIN
-        processed["asins"] = list(set(processed["asins"]))
+        processed = {
+            "asins": list(asins),
+            "amazonDomain": "amazon.com",  # 固定使用amazon.com
+            "proxyCountry": "AUTO_SELECT_PROXY_COUNTRY",
+            "useCaptchaSolver": False,
+        }
 
         return processed
 
@@ -184,10 +197,11 @@ class ApifyAmazonScraper(BaseCrawler):
             # 处理结果
             items = result.get("items", [])
             processed_items = []
+            scraped_at = datetime.utcnow().isoformat()
 
             for item in items:
                 try:
-                    processed_item = self._process_amazon_item(item)
+                    processed_item = self._process_amazon_item(item, scraped_at)
                     if AmazonProductData.validate_product_data(processed_item):
                         processed_items.append(processed_item)
                     else:
@@ -244,8 +258,9 @@ class ApifyAmazonScraper(BaseCrawler):
             )
 
             # 保存结果到JSON文件
+            # 分片并发执行时可能在同一秒内完成，追加随机后缀避免互相覆盖
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"apify_result_{timestamp}.json"
+            filename = f"apify_result_{timestamp}_{uuid.uuid4().hex[:8]}.json"
             logs_dir = Path("logs")
             logs_dir.mkdir(exist_ok=True)
 
@@ -258,10 +273,11 @@ class ApifyAmazonScraper(BaseCrawler):
             # 处理结果
             items = result.get("items", [])
             processed_items = []
+            scraped_at = datetime.utcnow().isoformat()
 
             for item in items:
                 try:
-                    processed_item = self._process_amazon_item(item)
+                    processed_item = self._process_amazon_item(item, scraped_at)
                     if AmazonProductData.validate_product_data(processed_item):
                         processed_items.append(processed_item)
                     else:
@@ -294,7 +310,9 @@ class ApifyAmazonScraper(BaseCrawler):
             self.logger.error(f"Unexpected error in Amazon scraper: {e}")
             return CrawlerResult(success=False, error=f"Unexpected error: {str(e)}")
 
-    def _process_amazon_item(self, item: dict[str, Any]) -> dict[str, Any]:
+    def _process_amazon_item(
+        self, item: dict[str, Any], scraped_at: Optional[str] = None
+    ) -> dict[str, Any]:
         """处理单个Amazon商品数据"""
 
         # 价格处理
@@ -302,26 +320,28 @@ class ApifyAmazonScraper(BaseCrawler):
         list_price = None
 
         # 现价
-        if item.get("price") and isinstance(item["price"], dict):
+        raw_price = item.get("price")
+        if raw_price and isinstance(raw_price, dict):
             try:
-                price = float(item["price"]["value"])
+                price = float(raw_price["value"])
             except (ValueError, TypeError):
                 pass
-        elif item.get("price"):
-            price_str = str(item["price"]).replace("$", "").replace(",", "")
+        elif raw_price:
+            price_str = str(raw_price).replace("$", "").replace(",", "")
             try:
                 price = float(price_str)
             except ValueError:
                 pass
 
         # 原价，建议零售价
-        if item.get("listPrice") and isinstance(item["listPrice"], dict):
+        raw_list_price = item.get("listPrice")
+        if raw_list_price and isinstance(raw_list_price, dict):
             try:
-                list_price = float(item["listPrice"]["value"])
+                list_price = float(raw_list_price["value"])
             except (ValueError, TypeError):
                 pass
-        elif item.get("listPrice"):
-            list_price_str = str(item["listPrice"]).replace("$", "").replace(",", "")
+        elif raw_list_price:
+            list_price_str = str(raw_list_price).replace("$", "").replace(",", "")
             try:
                 list_price = float(list_price_str)
             except ValueError:
@@ -329,17 +349,17 @@ class ApifyAmazonScraper(BaseCrawler):
 
         # 评分处理
         rating = None
-        if item.get("stars"):
+        if stars := item.get("stars"):
             try:
-                rating = float(item["stars"])
+                rating = float(stars)
             except (ValueError, TypeError):
                 pass
 
         # 评价数量处理
         review_count = 0
-        if item.get("reviewsCount"):
+        if reviews_count := item.get("reviewsCount"):
             try:
-                review_count_str = str(item["reviewsCount"]).replace(",", "")
+                review_count_str = str(reviews_count).replace(",", "")
                 review_count = int(review_count_str)
             except (ValueError, TypeError):
                 pass
@@ -347,17 +367,19 @@ class ApifyAmazonScraper(BaseCrawler):
         # 排名处理（支持数组）
         rank = None
         category = None
-        if item.get("bestsellerRanks") and isinstance(item["bestsellerRanks"], list):
+        bestseller_ranks = item.get("bestsellerRanks")
+        if bestseller_ranks and isinstance(bestseller_ranks, list):
             try:
-                rank = int(item["bestsellerRanks"][0]["rank"])
-                category = item["bestsellerRanks"][0]["category"]
+                top_rank = bestseller_ranks[0]
+                rank = int(top_rank["rank"])
+                category = top_rank["category"]
             except (ValueError, TypeError, KeyError, IndexError):
                 pass
 
         # 卖家信息
         seller_info = {}
-        if item.get("seller") and isinstance(item["seller"], dict):
-            seller = item["seller"]
+        seller = item.get("seller")
+        if seller and isinstance(seller, dict):
             seller_info = {
                 "name": seller.get("name"),
                 "url": seller.get("url"),
@@ -367,8 +389,9 @@ class ApifyAmazonScraper(BaseCrawler):
 
         # 变体信息（支持 variantDetails）
         variations = []
-        if item.get("variantDetails") and isinstance(item["variantDetails"], list):
-            for variant in item["variantDetails"]:
+        variant_details = item.get("variantDetails")
+        if variant_details and isinstance(variant_details, list):
+            for variant in variant_details:
                 variations.append({
                     "asin": variant.get("asin"),
                     "title": variant.get("name"),
@@ -404,6 +427,7 @@ class ApifyAmazonScraper(BaseCrawler):
                 "deal": item.get("deal"),
                 "sponsored": item.get("sponsored", False),
             },
+            scraped_at=scraped_at,
         )
 
     async def health_check(self) -> bool:
@@ -426,8 +450,63 @@ class ApifyAmazonScraper(BaseCrawler):
     async def scrape_multiple_products(
         self, asins: list[str], country: str = "US"
     ) -> CrawlerResult:
-        """爬取多个产品"""
-        return await self.crawl({"asins": asins, "country": country})
+        """爬取多个产品
+
+        ASIN数量超过batch_size时分片，并发运行多个Actor（受max_concurrent_batches限制），
+        再合并各分片结果。
+        """
+        batch_size = self.default_config["batch_size"]
+        if len(asins) <= batch_size:
+            return await self.crawl({"asins": asins, "country": country})
+
+        semaphore = asyncio.Semaphore(self.default_config["max_concurrent_batches"])
+
+        async def _crawl_batch(batch: list[str]) -> CrawlerResult:
+            async with semaphore:
+                return await self.crawl({"asins": batch, "country": country})
+
+        batches = [
+            asins[i : i + batch_size] for i in range(0, len(asins), batch_size)
+        ]
+        results = await asyncio.gather(
+            *[_crawl_batch(batch) for batch in batches], return_exceptions=True
+        )
+
+        products = []
+        raw_items = 0
+        runs = []
+        errors = []
+        for batch, result in zip(batches, results, strict=True):
+            if isinstance(result, BaseException):
+                errors.append({"asins": batch, "error": str(result)})
+                continue
+            if not result.success:
+                errors.append({"asins": batch, "error": result.error})
+                continue
+            products.extend(result.data.get("products", []))
+            raw_items += result.data.get("raw_items", 0)
+            runs.append(result.metadata)
+
+        if not runs:
+            return CrawlerResult(
+                success=False,
+                error=f"All {len(batches)} batches failed",
+                metadata={"batch_errors": errors},
+            )
+
+        return CrawlerResult(
+            success=True,
+            data={
+                "products": products,
+                "total_items": len(products),
+                "raw_items": raw_items,
+            },
+            metadata={
+                "batches": len(batches),
+                "runs": runs,
+                "batch_errors": errors,
+            },
+        )
 
     async def scrape_from_urls(self, urls: list[str]) -> CrawlerResult:
         """从URL列表爬取产品"""
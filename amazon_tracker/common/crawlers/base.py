@@ -124,8 +124,12 @@ class AmazonProductData:
         seller_info: Optional[dict[str, Any]] = None,
         shipping_info: Optional[dict[str, Any]] = None,
         additional_data: Optional[dict[str, Any]] = None,
+        scraped_at: Optional[str] = None,
     ) -> dict[str, Any]:
-        """创建标准化的产品数据结构"""
+        """创建标准化的产品数据结构
+
+        scraped_at为ISO格式时间字符串，批量处理时由调用方统一传入，未提供时取当前时间。
+        """
 
         return {
             # 基本信息
@@ -165,7 +169,7 @@ class AmazonProductData:
             # 物流信息
             "shipping_info": shipping_info or {},
             # 爬取元数据
-            "scraped_at": datetime.utcnow().isoformat(),
+            "scraped_at": scraped_at or datetime.utcnow().isoformat(),
             "data_version": "1.0",
             # 额外数据
             "additional_data": additional_data or {},
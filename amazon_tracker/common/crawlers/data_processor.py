@@ -2,12 +2,26 @@
 
 import logging
 import re
+import sys
 from typing import Any, Optional
 
 from .base import AmazonProductData
 
 logger = logging.getLogger(__name__)
 
+# 预编译的数字提取正则
+_DECIMAL_RE = re.compile(r"(\d+\.?\d*)")
+_INTEGER_RE = re.compile(r"(\d+)")
+
+# 预编译的ASIN提取正则
+_ASIN_URL_RE = re.compile(r"/([A-Z0-9]{10})/")
+
+# 预构建的字符删除表（str.translate比re.sub更快）
+_WHITESPACE = " \t\n\r\f\v\xa0"
+_PRICE_STRIP_TABLE = str.maketrans("", "", "$," + _WHITESPACE)
+_COUNT_STRIP_TABLE = str.maketrans("", "", "," + _WHITESPACE)
+_RANK_STRIP_TABLE = str.maketrans("", "", "#," + _WHITESPACE)
+
 
 class AmazonDataProcessor:
     """Amazon产品数据处理器"""
@@ -87,14 +101,14 @@ class AmazonDataProcessor:
 
         asin_str = str(asin).strip().upper()
 
-        # ASIN应该是10位字母数字组合
-        if len(asin_str) == 10 and asin_str.isalnum():
-            return asin_str
+        # ASIN应该是10位字母数字组合（已转大写，ASCII字母数字即[A-Z0-9]）
+        if len(asin_str) == 10 and asin_str.isascii() and asin_str.isalnum():
+            return sys.intern(asin_str)
 
         # 从URL中提取ASIN
-        asin_match = re.search(r"/([A-Z0-9]{10})/", str(asin))
+        asin_match = _ASIN_URL_RE.search(str(asin))
         if asin_match:
-            return asin_match.group(1)
+            return sys.intern(asin_match.group(1))
 
         return None
 
@@ -127,7 +141,8 @@ class AmazonDataProcessor:
         # 移除常见的前缀
         brand_str = re.sub(r"^(Brand:\s*|by\s+)", "", brand_str, flags=re.IGNORECASE)
 
-        return brand_str if brand_str else None
+        # 品牌取值重复度高，驻留后相同品牌共享同一个字符串对象
+        return sys.intern(brand_str) if brand_str else None
 
     def _clean_category(self, category: Any) -> Optional[str]:
         """清洗分类"""
@@ -144,32 +159,26 @@ class AmazonDataProcessor:
         category_str = str(category).strip()
         category_str = re.sub(r"\s+", " ", category_str)
 
-        return category_str if category_str else None
+        return sys.intern(category_str) if category_str else None
 
     def _clean_price(self, price: Any) -> Optional[float]:
         """清洗价格"""
+        # 数字类型快速路径（Apify数据大多已是数字）
+        price_type = type(price)
+        if price_type is float or price_type is int:
+            return float(price) if price > 0 else None
+
         if price is None:
             return None
 
-        try:
-            # 如果已经是数字
-            if isinstance(price, (int, float)):
-                return float(price) if price > 0 else None
-
-            # 清理价格字符串
-            price_str = str(price).strip()
+        # 清理价格字符串，移除货币符号、逗号和空白
+        price_str = str(price).translate(_PRICE_STRIP_TABLE)
 
-            # 移除货币符号和逗号
-            price_str = re.sub(r"[$,\s]", "", price_str)
-
-            # 提取数字（支持小数）
-            price_match = re.search(r"(\d+\.?\d*)", price_str)
-            if price_match:
-                price_value = float(price_match.group(1))
-                return price_value if price_value > 0 else None
-
-        except (ValueError, TypeError):
-            pass
+        # 提取数字（支持小数）
+        price_match = _DECIMAL_RE.search(price_str)
+        if price_match:
+            price_value = float(price_match.group(1))
+            return price_value if price_value > 0 else None
 
         return None
 
@@ -197,75 +206,55 @@ class AmazonDataProcessor:
         if rating is None:
             return None
 
-        try:
-            # 如果已经是数字
-            if isinstance(rating, (int, float)):
-                rating_value = float(rating)
-                return rating_value if 0 <= rating_value <= 5 else None
-
-            # 从字符串中提取评分
-            rating_str = str(rating).strip()
-            rating_match = re.search(r"(\d+\.?\d*)", rating_str)
-
-            if rating_match:
-                rating_value = float(rating_match.group(1))
-                return rating_value if 0 <= rating_value <= 5 else None
+        # 如果已经是数字
+        if isinstance(rating, (int, float)):
+            rating_value = float(rating)
+            return rating_value if 0 <= rating_value <= 5 else None
 
-        except (ValueError, TypeError):
-            pass
+        # 从字符串中提取评分（正则已保证匹配结果可被float解析，无需异常保护）
+        rating_match = _DECIMAL_RE.search(str(rating))
+        if rating_match:
+            rating_value = float(rating_match.group(1))
+            return rating_value if 0 <= rating_value <= 5 else None
 
         return None
 
     def _clean_review_count(self, review_count: Any) -> int:
         """清洗评论数量"""
+        # 整数类型快速路径
+        if type(review_count) is int:
+            return max(0, review_count)
+
         if review_count is None:
             return 0
 
-        try:
-            # 如果已经是数字
-            if isinstance(review_count, int):
-                return max(0, review_count)
-
-            # 清理评论数量字符串
-            count_str = str(review_count).strip()
-
-            # 移除逗号和其他非数字字符
-            count_str = re.sub(r"[,\s]", "", count_str)
-
-            # 提取数字
-            count_match = re.search(r"(\d+)", count_str)
-            if count_match:
-                return max(0, int(count_match.group(1)))
+        # 清理评论数量字符串，移除逗号和空白
+        count_str = str(review_count).translate(_COUNT_STRIP_TABLE)
 
-        except (ValueError, TypeError):
-            pass
+        # 提取数字
+        count_match = _INTEGER_RE.search(count_str)
+        if count_match:
+            return int(count_match.group(1))
 
         return 0
 
     def _clean_rank(self, rank: Any) -> Optional[int]:
         """清洗排名"""
+        # 整数类型快速路径
+        if type(rank) is int:
+            return rank if rank > 0 else None
+
         if rank is None:
             return None
 
-        try:
-            # 如果已经是数字
-            if isinstance(rank, int):
-                return rank if rank > 0 else None
-
-            # 从字符串中提取排名
-            rank_str = str(rank).strip()
-
-            # 移除#号、逗号等
-            rank_str = re.sub(r"[#,\s]", "", rank_str)
-
-            # 提取第一个数字
-            rank_match = re.search(r"(\d+)", rank_str)
-            if rank_match:
-                rank_value = int(rank_match.group(1))
-                return rank_value if rank_value > 0 else None
+        # 从字符串中提取排名，移除#号、逗号和空白
+        rank_str = str(rank).translate(_RANK_STRIP_TABLE)
 
-        except (ValueError, TypeError):
-            pass
+        # 提取第一个数字
+        rank_match = _INTEGER_RE.search(rank_str)
+        if rank_match:
+            rank_value = int(rank_match.group(1))
+            return rank_value if rank_value > 0 else None
 
         return None
 
@@ -349,24 +338,24 @@ class AmazonDataProcessor:
                 cleaned_var = {}
 
                 # 清洗变体ASIN
-                if variation.get("asin"):
-                    cleaned_var["asin"] = self._clean_asin(variation["asin"])
+                if asin := variation.get("asin"):
+                    cleaned_var["asin"] = self._clean_asin(asin)
 
                 # 清洗变体标题
-                if variation.get("title"):
-                    cleaned_var["title"] = self._clean_title(variation["title"])
+                if title := variation.get("title"):
+                    cleaned_var["title"] = self._clean_title(title)
 
                 # 清洗变体价格
-                if variation.get("price"):
-                    cleaned_var["price"] = self._clean_price(variation["price"])
+                if price := variation.get("price"):
+                    cleaned_var["price"] = self._clean_price(price)
 
                 # 清洗变体图片
-                if variation.get("image"):
-                    cleaned_var["image"] = self._clean_image_url(variation["image"])
+                if image := variation.get("image"):
+                    cleaned_var["image"] = self._clean_image_url(image)
 
                 # 清洗变体URL
-                if variation.get("url"):
-                    cleaned_var["url"] = str(variation["url"]).strip()
+                if raw_url := variation.get("url"):
+                    cleaned_var["url"] = str(raw_url).strip()
 
                 if any(cleaned_var.values()):
                     cleaned_variations.append(cleaned_var)
@@ -381,18 +370,18 @@ class AmazonDataProcessor:
         cleaned_seller = {}
 
         # 清洗卖家名称
-        if seller_info.get("name"):
-            cleaned_seller["name"] = str(seller_info["name"]).strip()
+        if name := seller_info.get("name"):
+            cleaned_seller["name"] = str(name).strip()
 
         # 清洗卖家URL
-        if seller_info.get("url"):
-            url = str(seller_info["url"]).strip()
+        if raw_url := seller_info.get("url"):
+            url = str(raw_url).strip()
             if url.startswith(("http://", "https://")):
                 cleaned_seller["url"] = url
 
         # 清洗卖家评分
-        if seller_info.get("rating"):
-            rating = self._clean_rating(seller_info["rating"])
+        if raw_rating := seller_info.get("rating"):
+            rating = self._clean_rating(raw_rating)
             if rating is not None:
                 cleaned_seller["rating"] = rating
 
@@ -423,14 +412,13 @@ class AmazonDataProcessor:
         cleaned_additional = {}
 
         # 清洗产品URL
-        if additional_data.get("url"):
-            url = str(additional_data["url"]).strip()
+        if raw_url := additional_data.get("url"):
+            url = str(raw_url).strip()
             if url.startswith(("http://", "https://")):
                 cleaned_additional["url"] = url
 
         # 清洗面包屑导航
-        if additional_data.get("breadcrumbs"):
-            breadcrumbs = additional_data["breadcrumbs"]
+        if breadcrumbs := additional_data.get("breadcrumbs"):
             if isinstance(breadcrumbs, list):
                 cleaned_breadcrumbs = []
                 for crumb in breadcrumbs:
@@ -440,12 +428,12 @@ class AmazonDataProcessor:
                     cleaned_additional["breadcrumbs"] = cleaned_breadcrumbs
 
         # 清洗优惠券信息
-        if additional_data.get("coupon"):
-            cleaned_additional["coupon"] = str(additional_data["coupon"]).strip()
+        if coupon := additional_data.get("coupon"):
+            cleaned_additional["coupon"] = str(coupon).strip()
 
         # 清洗促销信息
-        if additional_data.get("deal"):
-            cleaned_additional["deal"] = str(additional_data["deal"]).strip()
+        if deal := additional_data.get("deal"):
+            cleaned_additional["deal"] = str(deal).strip()
 
         # 清洗广告标记
         if "sponsored" in additional_data:
@@ -1,6 +1,10 @@
 """数据库基类和连接管理"""
 
+import json
 import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from decimal import Decimal
 from pathlib import Path
 from typing import Any
 
@@ -11,6 +15,13 @@ project_root = Path(__file__).parent.parent.parent.parent
 load_dotenv(project_root / ".env.local")
 load_dotenv(project_root / ".env")
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from sqlalchemy import (
     BigInteger,
     Boolean,
@@ -36,6 +47,27 @@ SYNC_DATABASE_URL = (
     DATABASE_URL.replace("+asyncpg", "") if "+asyncpg" in DATABASE_URL else DATABASE_URL
 )
 
+
+def _json_default(obj: Any) -> Any:
+    """JSON无法原生编码的类型：Decimal转为float，numpy标量/数组转为Python对象"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if type(obj).__module__ == "numpy" and hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_serializer(value: Any) -> str:
+    """JSON/JSONB列的序列化函数（优先使用orjson，未安装时退回标准库json）"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            value,
+            default=_json_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        ).decode()
+    return json.dumps(value, default=_json_default)
+
+
 # 数据库引擎配置（同步版本）
 engine = create_engine(
     SYNC_DATABASE_URL,
@@ -44,6 +76,7 @@ engine = create_engine(
     max_overflow=0,
     pool_pre_ping=True,
     echo=False,  # 生产环境设置为False
+    json_serializer=json_serializer,
 )
 
 # 会话工厂
@@ -106,6 +139,16 @@ def get_db_session() -> Session:
         raise
 
 
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """数据库会话上下文管理器，退出时自动关闭会话"""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def init_db():
     """初始化数据库"""
     Base.metadata.create_all(bind=engine)
@@ -8,6 +8,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from ..config.settings import get_settings
+from .base import json_serializer
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +37,7 @@ def init_db():
             pool_pre_ping=True,
             pool_recycle=300,
             echo=settings.DEBUG,
+            json_serializer=json_serializer,
         )
 
         # 创建会话工厂
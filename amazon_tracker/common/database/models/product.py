@@ -5,8 +5,10 @@ from datetime import datetime
 from typing import Any
 
 from sqlalchemy import (
+    DDL,
     Boolean,
     Column,
+    Date,
     DateTime,
     ForeignKey,
     Index,
@@ -15,13 +17,14 @@ from sqlalchemy import (
     String,
     Text,
     UniqueConstraint,
+    event,
 )
 from sqlalchemy import (
     Enum as SQLEnum,
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import column, func, table
 
 from ..base import BaseModel, TenantMixin
 
@@ -132,6 +135,25 @@ class Product(BaseModel, TenantMixin):
         Index("ix_product_last_scraped", "last_scraped_at"),
         Index("ix_product_tracking_frequency", "tracking_frequency"),
         Index("ix_product_is_competitor", "tenant_id", "is_competitor"),
+        Index(
+            "ix_product_tenant_marketplace_deleted",
+            "tenant_id",
+            "marketplace",
+            "is_deleted",
+        ),
+        # 支持category/brand的ILIKE '%...%'模糊匹配（需要pg_trgm扩展）
+        Index(
+            "gin_product_category_trgm",
+            "category",
+            postgresql_using="gin",
+            postgresql_ops={"category": "gin_trgm_ops"},
+        ),
+        Index(
+            "gin_product_brand_trgm",
+            "brand",
+            postgresql_using="gin",
+            postgresql_ops={"brand": "gin_trgm_ops"},
+        ),
     )
 
     @property
@@ -178,6 +200,14 @@ class Product(BaseModel, TenantMixin):
         return f"<Product(asin='{self.asin}', title='{self.title[:50]}...', tenant_id='{self.tenant_id}')>"
 
 
+# trigram索引依赖pg_trgm扩展：create_all建表前先确保扩展存在
+event.listen(
+    Product.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
 class ProductPriceHistory(BaseModel):
     """产品价格历史"""
 
@@ -240,6 +270,27 @@ class ProductRankHistory(BaseModel):
         return f"<ProductRankHistory(product_id={self.product_id}, rank={self.rank}, recorded_at={self.recorded_at})>"
 
 
+# 按日汇总的价格/排名历史（物化视图，由迁移创建、定时任务刷新，不参与ORM建表）
+# 每行对应 (product_id, day)，跨产品日均值 = sum(value_sum) / sum(sample_count)
+product_price_daily = table(
+    "product_price_daily",
+    column("product_id", Integer),
+    column("day", Date),
+    column("value_sum", Numeric),
+    column("sample_count", Integer),
+)
+
+product_rank_daily = table(
+    "product_rank_daily",
+    column("product_id", Integer),
+    column("day", Date),
+    column("value_sum", Numeric),
+    column("sample_count", Integer),
+)
+
+DAILY_SUMMARY_VIEWS = ("product_price_daily", "product_rank_daily")
+
+
 class ProductAlert(BaseModel, TenantMixin):
     """产品预警"""
 
@@ -103,6 +103,7 @@ celery_app.autodiscover_tasks(
 try:
     import amazon_tracker.common.task_queue.crawler_tasks
     import amazon_tracker.common.task_queue.monitoring_tasks
+    import amazon_tracker.common.task_queue.maintenance_tasks
 except ImportError as e:
     print(f"Warning: Could not import task modules: {e}")
 
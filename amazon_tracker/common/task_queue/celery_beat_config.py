@@ -17,6 +17,19 @@ CELERY_BEAT_SCHEDULE = {
         "schedule": 3000.0,  # 每3000秒执行
         "options": {"queue": "crawler", "routing_key": "crawler"},
     },
+    # ===== 维护任务 =====
+    # 每小时刷新价格/排名按日汇总物化视图
+    "daily-summary-refresh": {
+        "task": "amazon_tracker.common.task_queue.maintenance_tasks.refresh_daily_summary_views",
+        "schedule": crontab(minute=5),  # 每小时第5分钟
+        "options": {"queue": "maintenance", "routing_key": "maintenance"},
+    },
+    # 每10秒批量写回会话活动时间
+    "session-activity-flush": {
+        "task": "amazon_tracker.common.task_queue.maintenance_tasks.flush_session_activity",
+        "schedule": 10.0,  # 每10秒执行
+        "options": {"queue": "maintenance", "routing_key": "maintenance"},
+    },
 }
 
 # Celery Beat时区设置
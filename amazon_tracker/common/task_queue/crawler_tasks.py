@@ -3,7 +3,7 @@
 import logging
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, Optional
 
 from celery import Task
 from sqlalchemy.exc import IntegrityError
@@ -302,6 +302,12 @@ def crawl_multiple_products(
             # 清洗和验证数据
             processed_products = processor.process_batch(raw_products)
 
+            # 按ASIN建立产品索引，避免每条结果线性扫描
+            products_by_asin = {product.asin: product for product in products}
+
+            # 同一批次共用一个记录时间
+            crawled_at = datetime.utcnow()
+
             # 更新产品信息
             updated_products = []
             for product_data in processed_products:
@@ -310,13 +316,13 @@ def crawl_multiple_products(
                     continue
 
                 # 找到对应的产品
-                product = next((p for p in products if p.asin == asin), None)
+                product = products_by_asin.get(asin)
                 if not product:
                     continue
 
                 # 更新产品信息
                 updated_fields = _update_product_from_crawl_data(
-                    db, product, product_data
+                    db, product, product_data, crawled_at
                 )
 
                 # 记录价格历史
@@ -327,7 +333,7 @@ def crawl_multiple_products(
                         list_price=product_data.get("list_price"),
                         buy_box_price=product_data.get("buy_box_price"),
                         currency=product_data.get("currency", "USD"),
-                        recorded_at=datetime.utcnow(),
+                        recorded_at=crawled_at,
                     )
                     db.add(price_history)
 
@@ -337,7 +343,7 @@ def crawl_multiple_products(
                         product_id=product.id,
                         rank=product_data["rank"],
                         category=product_data.get("category"),
-                        recorded_at=datetime.utcnow(),
+                        recorded_at=crawled_at,
                     )
                     db.add(rank_history)
 
@@ -506,9 +512,15 @@ def schedule_product_tracking(self):
 
 
 def _update_product_from_crawl_data(
-    db: Session, product: Product, product_data: dict[str, Any]
+    db: Session,
+    product: Product,
+    product_data: dict[str, Any],
+    crawled_at: Optional[datetime] = None,
 ) -> list[str]:
-    """从爬取数据更新产品信息"""
+    """从爬取数据更新产品信息
+
+    批量处理时由调用方传入同一批次的crawled_at，避免逐个产品取当前时间。
+    """
     updated_fields = []
 
     # 更新标题
@@ -563,7 +575,7 @@ def _update_product_from_crawl_data(
         updated_fields.append("image_url")
 
     # 更新最后爬取时间
-    product.last_crawled_at = datetime.utcnow()
+    product.last_crawled_at = crawled_at or datetime.utcnow()
     updated_fields.append("last_crawled_at")
 
     return updated_fields
@@ -842,6 +854,9 @@ def crawl_products_batch(self, tenant_id: str = None):
             # 已经处理过的asin就不再处理了
             asin_list = []
 
+            # 同一批次共用一个记录时间
+            crawled_at = datetime.utcnow()
+
             for product_data in result.data.get("products", []):
                 asin = product_data.get("asin")
                 print("结果：", asin)
@@ -866,7 +881,7 @@ def crawl_products_batch(self, tenant_id: str = None):
 
                     if existing_product:
                         # 更新现有产品
-                        changes = _update_product_from_crawl_data(db, existing_product, product_data)
+                        changes = _update_product_from_crawl_data(db, existing_product, product_data, crawled_at)
 
                         # 记录价格历史
                         if product_data.get("price"):
@@ -876,7 +891,7 @@ def crawl_products_batch(self, tenant_id: str = None):
                                 list_price=product_data.get("list_price"),
                                 buy_box_price=product_data.get("buy_box_price"),
                                 currency=product_data.get("currency", "USD"),
-                                recorded_at=datetime.utcnow(),
+                                recorded_at=crawled_at,
                             )
                             db.add(price_history)
 
@@ -886,7 +901,7 @@ def crawl_products_batch(self, tenant_id: str = None):
                                 product_id=existing_product.id,
                                 rank=product_data["rank"],
                                 category=product_data.get("category"),
-                                recorded_at=datetime.utcnow(),
+                                recorded_at=crawled_at,
                                 review_count=product_data.get("review_count"),
                                 rating=product_data.get("rating")
                             )
@@ -918,7 +933,7 @@ def crawl_products_batch(self, tenant_id: str = None):
                             product_data=product_data,
                             bullet_points=product_data.get("bullet_points", []),
                             description=product_data.get("description"),
-                            last_scraped_at=datetime.utcnow(),
+                            last_scraped_at=crawled_at,
                         )
 
                         db.add(new_product)
@@ -932,7 +947,7 @@ def crawl_products_batch(self, tenant_id: str = None):
                                 list_price=product_data.get("list_price"),
                                 buy_box_price=product_data.get("buy_box_price"),
                                 currency=product_data.get("currency", "USD"),
-                                recorded_at=datetime.utcnow(),
+                                recorded_at=crawled_at,
                             )
                             db.add(price_history)
 
@@ -942,7 +957,7 @@ def crawl_products_batch(self, tenant_id: str = None):
                                 product_id=new_product.id,
                                 rank=product_data["rank"],
                                 category=product_data.get("category"),
-                                recorded_at=datetime.utcnow(),
+                                recorded_at=crawled_at,
                                 review_count=product_data.get("review_count"),
                                 rating=product_data.get("rating")
                             )
@@ -969,7 +984,7 @@ def crawl_products_batch(self, tenant_id: str = None):
                                 .first()
                             )
                             if existing_product:
-                                _update_product_from_crawl_data(db, existing_product, product_data)
+                                _update_product_from_crawl_data(db, existing_product, product_data, crawled_at)
                                 updated_count += 1
                                 task_logger.info(f"Updated existing product {asin}")
                         except Exception as update_e:
@@ -0,0 +1,89 @@
+"""维护相关的Celery任务"""
+
+import logging
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import bindparam, text
+
+from ..auth.jwt_auth import SESSION_ACTIVITY_KEY
+from ..cache.redis_manager import cache_manager
+from ..database.connection import get_db_session
+from ..database.models.product import DAILY_SUMMARY_VIEWS
+from ..database.models.user import UserSession
+from .celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(bind=True, queue="maintenance")
+def refresh_daily_summary_views(self) -> dict[str, Any]:
+    """刷新价格/排名历史的按日汇总物化视图
+
+    使用CONCURRENTLY刷新，刷新期间市场趋势查询仍可读取旧数据。
+    """
+    refreshed = []
+
+    try:
+        with get_db_session() as db:
+            for view_name in DAILY_SUMMARY_VIEWS:
+                db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view_name}"))
+                refreshed.append(view_name)
+            db.commit()
+
+        logger.info(f"Refreshed daily summary views: {', '.join(refreshed)}")
+        return {"status": "success", "refreshed_views": refreshed}
+
+    except Exception as e:
+        logger.error(f"Failed to refresh daily summary views: {e}")
+        return {"status": "failed", "error": str(e), "refreshed_views": refreshed}
+
+
+@celery_app.task(bind=True, queue="maintenance")
+def flush_session_activity(self) -> dict[str, Any]:
+    """将Redis中累积的会话活动时间批量写回user_sessions表
+
+    在事务中将有序集合合并进处理中键并删除原键，避免读取与删除之间新写入的
+    记录丢失；处理中键只在数据库提交成功后删除，上次失败遗留的记录会与本次
+    新记录合并（取较新的时间）后一并重试。
+    """
+    processing_key = f"{SESSION_ACTIVITY_KEY}:processing"
+
+    try:
+        client = cache_manager.client
+        pipe = client.pipeline(transaction=True)
+        pipe.zunionstore(
+            processing_key, [processing_key, SESSION_ACTIVITY_KEY], aggregate="MAX"
+        )
+        pipe.delete(SESSION_ACTIVITY_KEY)
+        pipe.execute()
+
+        entries = client.zrange(processing_key, 0, -1, withscores=True)
+        if not entries:
+            return {"status": "success", "updated_sessions": 0}
+
+        table = UserSession.__table__
+        stmt = (
+            table.update()
+            .where(table.c.session_id == bindparam("sid"))
+            .values(last_activity_at=bindparam("ts"))
+        )
+        params = [
+            {
+                "sid": session_id.decode(),
+                "ts": datetime.utcfromtimestamp(ts),
+            }
+            for session_id, ts in entries
+        ]
+
+        with get_db_session() as db:
+            db.execute(stmt, params)
+            db.commit()
+
+        client.delete(processing_key)
+        logger.info(f"Flushed activity for {len(params)} user sessions")
+        return {"status": "success", "updated_sessions": len(params)}
+
+    except Exception as e:
+        logger.error(f"Failed to flush session activity: {e}")
+        return {"status": "failed", "error": str(e)}
@@ -2,6 +2,7 @@
 
 import csv
 import io
+import itertools
 import logging
 from typing import Optional
 
@@ -59,6 +60,31 @@ class ProductImportItem(BaseModel):
     tracking_frequency: TrackingFrequency = TrackingFrequency.DAILY
 
 
+def _load_existing_products(
+    db: Session,
+    tenant_id: str,
+    asins: list[str],
+    product_cache: Optional[dict[str, int]] = None,
+) -> dict[str, int]:
+    """一次查询获取租户下已存在产品的 ASIN -> 产品ID 映射
+
+    传入product_cache时只查询缓存中没有的ASIN，并将查询结果写回缓存，
+    调用方可在多次导入之间复用同一个缓存。
+    """
+    existing = product_cache if product_cache is not None else {}
+    missing = [asin for asin in asins if asin not in existing]
+    if not missing:
+        return existing
+
+    rows = (
+        db.query(Product.asin, Product.id)
+        .filter(Product.tenant_id == tenant_id, Product.asin.in_(missing))
+        .all()
+    )
+    existing.update(rows)
+    return existing
+
+
 @router.post("/asins", response_model=BulkImportResult)
 async def bulk_import_by_asins(
     request: BulkImportRequest,
@@ -68,7 +94,7 @@ async def bulk_import_by_asins(
     """通过ASIN列表批量导入产品"""
 
     # 权限检查
-    require_permission(current_user, PermissionScope.PRODUCT_CREATE)
+    require_permission(current_user, PermissionScope.PRODUCTS_WRITE)
 
     logger.info(f"Starting bulk import for {len(request.asins)} ASINs")
 
@@ -88,67 +114,77 @@ async def bulk_import_by_asins(
                 {"asin": asin, "reason": "Invalid ASIN format"}
             )
 
-    # 检查重复产品
+    tenant_id = current_user["tenant_id"]
+
+    # 一次查询检查所有重复产品
+    existing_products = _load_existing_products(db, tenant_id, valid_asins)
+
+    new_products: dict[str, Product] = {}
+    duplicate_asins = []
     for asin in valid_asins:
-        existing_product = (
-            db.query(Product)
-            .filter(
-                Product.asin == asin, Product.tenant_id == current_user["tenant_id"]
-            )
-            .first()
+        if asin in existing_products or asin in new_products:
+            duplicate_asins.append(asin)
+            continue
+
+        # 创建产品记录
+        new_products[asin] = Product(
+            asin=asin,
+            title=f"Product {asin}",  # 临时标题，爬取后更新
+            category=request.category,
+            marketplace=request.marketplace,
+            tracking_frequency=request.tracking_frequency,
+            status=ProductStatus.ACTIVE,
+            tenant_id=tenant_id,
+            product_url=f"https://www.amazon.com/dp/{asin}",
         )
 
-        if existing_product:
-            import_results["duplicates"].append(
-                {
-                    "asin": asin,
-                    "product_id": existing_product.id,
-                    "status": "Already exists",
-                }
+    # 批量写入新产品，一次flush获取所有ID
+    if new_products:
+        try:
+            db.add_all(new_products.values())
+            db.flush()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to create products for bulk import: {e}")
+            import_results["failed"].extend(
+                {"asin": asin, "reason": str(e)} for asin in new_products
+            )
+            new_products = {}
+
+    for asin, product in new_products.items():
+        existing_products[asin] = product.id
+
+        # 如果开启自动爬取，创建爬虫任务
+        if request.auto_crawl:
+            crawl_amazon_product.delay(
+                product_id=product.id,
+                tenant_id=tenant_id,
+                config={
+                    "country": request.marketplace.value.split("_")[1]
+                    if "_" in request.marketplace.value
+                    else "US"
+                },
             )
-        else:
-            # 创建产品记录
-            try:
-                product = Product(
-                    asin=asin,
-                    title=f"Product {asin}",  # 临时标题，爬取后更新
-                    category=request.category,
-                    marketplace=request.marketplace,
-                    tracking_frequency=request.tracking_frequency,
-                    status=ProductStatus.PENDING,
-                    tenant_id=current_user["tenant_id"],
-                    created_by=current_user["user_id"],
-                )
-
-                db.add(product)
-                db.flush()
-
-                # 如果开启自动爬取，创建爬虫任务
-                if request.auto_crawl:
-                    crawl_amazon_product.delay(
-                        product_id=product.id,
-                        tenant_id=current_user["tenant_id"],
-                        config={
-                            "country": request.marketplace.value.split("_")[1]
-                            if "_" in request.marketplace.value
-                            else "US"
-                        },
-                    )
 
-                import_results["successful"].append(
-                    {
-                        "asin": asin,
-                        "product_id": product.id,
-                        "status": "Created",
-                        "crawl_scheduled": request.auto_crawl,
-                    }
-                )
+        import_results["successful"].append(
+            {
+                "asin": asin,
+                "product_id": product.id,
+                "status": "Created",
+                "crawl_scheduled": request.auto_crawl,
+            }
+        )
 
-                logger.info(f"Successfully created product for ASIN: {asin}")
+    import_results["duplicates"] = [
+        {
+            "asin": asin,
+            "product_id": existing_products.get(asin),
+            "status": "Already exists",
+        }
+        for asin in duplicate_asins
+    ]
 
-            except Exception as e:
-                logger.error(f"Failed to create product for ASIN {asin}: {e}")
-                import_results["failed"].append({"asin": asin, "reason": str(e)})
+    logger.info(f"Created {len(new_products)} products for bulk import")
 
     db.commit()
 
@@ -176,7 +212,7 @@ async def bulk_import_from_csv(
     """
 
     # 权限检查
-    require_permission(current_user, PermissionScope.PRODUCT_CREATE)
+    require_permission(current_user, PermissionScope.PRODUCTS_WRITE)
 
     # 验证文件类型
     if not file.filename.endswith(".csv"):
@@ -194,10 +230,18 @@ async def bulk_import_from_csv(
             "duplicates": [],
         }
 
-        row_count = 0
-        for row in csv_reader:
-            row_count += 1
+        # 最多读取101行（第101行仅用于判断是否超出导入上限）
+        rows = list(itertools.islice(csv_reader, 101))
 
+        # 一次查询获取已存在的产品，替代逐行查重
+        existing_products = _load_existing_products(
+            db,
+            current_user["tenant_id"],
+            [(row.get("asin") or "").strip() for row in rows[:100]],
+        )
+
+        row_count = 0
+        for row_count, row in enumerate(rows, 1):
             # 限制导入数量
             if row_count > 100:
                 import_results["failed"].append(
@@ -217,22 +261,15 @@ async def bulk_import_from_csv(
                     )
                     continue
 
-                # 检查重复
-                existing_product = (
-                    db.query(Product)
-                    .filter(
-                        Product.asin == asin,
-                        Product.tenant_id == current_user["tenant_id"],
-                    )
-                    .first()
-                )
+                # 检查重复（包括CSV中前面行刚创建的产品）
+                existing_product_id = existing_products.get(asin)
 
-                if existing_product:
+                if existing_product_id:
                     import_results["duplicates"].append(
                         {
                             "row": row_count,
                             "asin": asin,
-                            "product_id": existing_product.id,
+                            "product_id": existing_product_id,
                             "status": "Already exists",
                         }
                     )
@@ -260,13 +297,14 @@ async def bulk_import_from_csv(
                     category=row.get("category", "").strip() or None,
                     marketplace=marketplace,
                     tracking_frequency=frequency,
-                    status=ProductStatus.PENDING,
+                    status=ProductStatus.ACTIVE,
                     tenant_id=current_user["tenant_id"],
-                    created_by=current_user["user_id"],
+                    product_url=f"https://www.amazon.com/dp/{asin}",
                 )
 
                 db.add(product)
                 db.flush()
+                existing_products[asin] = product.id
 
                 # 自动创建爬虫任务
                 crawl_amazon_product.delay(
@@ -347,7 +385,7 @@ async def import_demo_products(
     """导入预设的Demo产品（蓝牙耳机）"""
 
     # 权限检查
-    require_permission(current_user, PermissionScope.PRODUCT_CREATE)
+    require_permission(current_user, PermissionScope.PRODUCTS_WRITE)
 
     # 预设的蓝牙耳机ASIN
     demo_asins = [
@@ -41,7 +41,7 @@ async def generate_report(
     if not token_data:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    current_user_data = get_current_user(token_data)
+    current_user_data = await get_current_user(token_data)
     if not current_user_data:
         raise HTTPException(status_code=401, detail="User not found")
 
@@ -1,7 +1,6 @@
 """异常检测服务"""
 
 import logging
-import statistics
 from datetime import datetime, timedelta
 from typing import Any, Optional
 
@@ -81,7 +80,7 @@ class AnomalyDetector:
                 if not historical_prices:
                     return {"is_anomaly": False, "reason": "No valid historical prices"}
 
-                avg_price = statistics.mean(historical_prices)
+                avg_price = sum(historical_prices) / len(historical_prices)
 
                 # 计算变化百分比
                 change_percent = abs(current_price - avg_price) / avg_price * 100
@@ -163,7 +162,7 @@ class AnomalyDetector:
                 if not historical_ranks:
                     return {"is_anomaly": False, "reason": "No valid historical ranks"}
 
-                avg_rank = statistics.mean(historical_ranks)
+                avg_rank = sum(historical_ranks) / len(historical_ranks)
 
                 # 计算变化百分比
                 change_percent = abs(current_rank - avg_rank) / avg_rank * 100
@@ -242,7 +241,7 @@ class AnomalyDetector:
 
                 # 计算平均Buy Box价格
                 historical_prices = [float(p.buy_box_price) for p in price_history]
-                avg_buy_box_price = statistics.mean(historical_prices)
+                avg_buy_box_price = sum(historical_prices) / len(historical_prices)
 
                 # 计算变化百分比
                 if avg_buy_box_price == 0:
@@ -8,7 +8,7 @@ from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy import and_
 from sqlalchemy.orm import Session
 
-from amazon_tracker.common.auth.jwt_auth import JWTBearer, jwt_auth
+from amazon_tracker.common.auth.jwt_auth import JWTBearer, get_jwt_auth
 from amazon_tracker.common.auth.models import (
     AuthUser,
     ChangePasswordRequest,
@@ -170,13 +170,13 @@ async def login(
 
     # 创建JWT令牌
     access_token_expires = timedelta(days=30)  # 访问令牌30天过期
-    access_token = jwt_auth.create_access_token(
+    access_token = get_jwt_auth().create_access_token(
         user, str(session.session_id), access_token_expires
     )
 
     refresh_token = None
     if request.remember_me:
-        refresh_token = jwt_auth.create_refresh_token(
+        refresh_token = get_jwt_auth().create_refresh_token(
             user, str(session.session_id), session_expires
         )
         session.refresh_token = refresh_token
@@ -211,12 +211,12 @@ async def refresh_token(
 ):
     """刷新访问令牌"""
 
-    new_access_token = jwt_auth.refresh_access_token(request.refresh_token)
+    new_access_token = get_jwt_auth().refresh_access_token(request.refresh_token)
 
     return {
         "access_token": new_access_token,
         "token_type": "bearer",
-        "expires_in": jwt_auth.access_token_expire_minutes * 60,
+        "expires_in": get_jwt_auth().access_token_expire_minutes * 60,
     }
 
 
@@ -227,7 +227,7 @@ async def logout(
 ):
     """用户登出"""
 
-    token_data = jwt_auth.verify_token(credentials.credentials)
+    token_data = get_jwt_auth().verify_token(credentials.credentials)
 
     # 使会话失效
     session = (
@@ -243,8 +243,8 @@ async def logout(
         session.invalidate()
         db.commit()
 
-    # TODO: 将JWT令牌加入黑名单
-    jwt_auth.invalidate_token(token_data.jti)
+    # 将JWT令牌加入黑名单
+    get_jwt_auth().invalidate_token(token_data.jti, token_data.exp)
 
     return {"message": "登出成功"}
 
@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy import or_
 from sqlalchemy.orm import Session
-from amazon_tracker.common.auth.jwt_auth import JWTBearer
+from amazon_tracker.common.auth.jwt_auth import JWTBearer, invalidate_current_user
 from amazon_tracker.common.auth.models import (
     APIKeyInfo,
     APIKeyRequest,
@@ -47,7 +47,7 @@ async def get_current_user_profile(
     if not token_data:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    current_user = get_current_user(token_data)
+    current_user = await get_current_user(token_data)
     if not current_user:
         raise HTTPException(status_code=401, detail="User not found")
 
@@ -106,6 +106,7 @@ async def update_current_user_profile(
             setattr(user, field, value)
 
     db.commit()
+    invalidate_current_user(user.id)
 
     return {"message": "档案更新成功"}
 
@@ -218,6 +219,7 @@ async def update_user_status(
 
     user.status = new_status
     db.commit()
+    invalidate_current_user(user.id)
 
     return {"message": f"用户状态已更新为 {new_status.value}"}
 
@@ -248,6 +250,7 @@ async def delete_user(
     user.is_deleted = True
     user.status = UserStatus.INACTIVE
     db.commit()
+    invalidate_current_user(user.id)
 
     return {"message": "用户已删除"}
 
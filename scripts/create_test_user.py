@@ -21,7 +21,7 @@ if "+asyncpg" in original_url:
     sync_url = original_url.replace("postgresql+asyncpg://", "postgresql://")
     os.environ["DATABASE_URL"] = sync_url
 
-from amazon_tracker.common.auth.jwt_auth import jwt_auth
+from amazon_tracker.common.auth.jwt_auth import get_jwt_auth
 from amazon_tracker.common.database.connection import get_db_session
 from amazon_tracker.common.database.models.user import Tenant, User, UserStatus
 
@@ -71,7 +71,7 @@ def create_test_user():
 
             session_id = secrets.token_urlsafe(32)
 
-            access_token = jwt_auth.create_access_token(user, session_id)
+            access_token = get_jwt_auth().create_access_token(user, session_id)
 
             print("\n🔑 访问令牌生成成功:")
             print(f"用户ID: {user.id}")
@@ -0,0 +1,160 @@
+"""JWT认证管理器单元测试"""
+
+import time
+
+import pytest
+from fastapi import HTTPException
+from unittest.mock import Mock, patch
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..')))
+
+from amazon_tracker.common.auth.jwt_auth import (
+    TOKEN_BLACKLIST_PREFIX,
+    USER_ROLES_CACHE_TTL,
+    JWTAuth,
+)
+
+
+class FakeCache:
+    """基于字典的cache_manager替身"""
+
+    def __init__(self):
+        self.store = {}
+        self.ttls = {}
+
+    def get(self, key, prefix=None):
+        return self.store.get(key)
+
+    def set(self, key, value, ttl=None, prefix=None):
+        self.store[key] = value
+        self.ttls[key] = ttl
+        return True
+
+    def exists(self, key, prefix=None):
+        return key in self.store
+
+    def expire_all(self):
+        self.store.clear()
+
+
+class TestTokenRevocation:
+    """令牌吊销测试"""
+
+    def setup_method(self):
+        """测试前设置"""
+        self.cache = FakeCache()
+        self.patcher = patch(
+            'amazon_tracker.common.auth.jwt_auth.cache_manager', self.cache
+        )
+        self.patcher.start()
+        self.auth = JWTAuth()
+
+        user = Mock()
+        user.id = 4
+        user.email = "admin@demo.com"
+        user.username = "admin"
+        user.tenant_id = "tenant_demo"
+        user.is_super_admin = False
+        self.token = self.auth.create_access_token(user, "session-1")
+
+    def teardown_method(self):
+        """测试后清理"""
+        self.patcher.stop()
+
+    def test_valid_token_accepted(self):
+        """未吊销的令牌验证通过"""
+        token_data = self.auth.verify_token(self.token)
+
+        assert token_data.user_id == 4
+        assert token_data.session_id == "session-1"
+
+    def test_revoked_token_rejected(self):
+        """吊销后的令牌返回401"""
+        token_data = self.auth.verify_token(self.token)
+
+        self.auth.invalidate_token(token_data.jti, token_data.exp)
+
+        with pytest.raises(HTTPException) as exc_info:
+            self.auth.verify_token(self.token)
+        assert exc_info.value.status_code == 401
+        assert exc_info.value.detail == "Token revoked"
+
+    def test_revocation_bypasses_verified_token_cache(self):
+        """已缓存的验证结果同样受黑名单约束"""
+        token_data = self.auth.verify_token(self.token)
+        assert self.auth._token_cache
+
+        self.auth.invalidate_token(token_data.jti, token_data.exp)
+
+        with pytest.raises(HTTPException):
+            self.auth.verify_token(self.token)
+
+    def test_blacklist_entry_expires_with_token(self):
+        """黑名单条目保留至令牌原过期时间"""
+        token_data = self.auth.verify_token(self.token)
+
+        self.auth.invalidate_token(token_data.jti, token_data.exp)
+
+        ttl = self.cache.ttls[f"{TOKEN_BLACKLIST_PREFIX}:{token_data.jti}"]
+        assert 0 < ttl <= token_data.exp - int(time.time()) + 1
+
+    def test_expired_token_blacklisted_briefly(self):
+        """已过期令牌的黑名单TTL至少为1秒"""
+        self.auth.invalidate_token("expired-jti", int(time.time()) - 60)
+
+        assert self.cache.ttls[f"{TOKEN_BLACKLIST_PREFIX}:expired-jti"] == 1
+
+
+class TestUserPermissionsCache:
+    """用户角色/权限缓存测试"""
+
+    def setup_method(self):
+        """测试前设置"""
+        self.cache = FakeCache()
+        self.patcher = patch(
+            'amazon_tracker.common.auth.jwt_auth.cache_manager', self.cache
+        )
+        self.patcher.start()
+        self.auth = JWTAuth()
+
+    def teardown_method(self):
+        """测试后清理"""
+        self.patcher.stop()
+
+    def test_cached_roles_skip_database(self):
+        """缓存命中时不查询数据库"""
+        self.auth._load_user_permissions = Mock(
+            return_value=(["viewer"], ["product:read"])
+        )
+
+        assert self.auth.get_user_permissions(1) == (["viewer"], ["product:read"])
+        assert self.auth.get_user_permissions(1) == (["viewer"], ["product:read"])
+
+        self.auth._load_user_permissions.assert_called_once_with(1)
+        assert self.cache.ttls["user:1:roles"] == USER_ROLES_CACHE_TTL
+
+    def test_role_change_visible_after_cache_expiry(self):
+        """角色变更在缓存过期后可见"""
+        self.auth._load_user_permissions = Mock(
+            return_value=(["viewer"], ["product:read"])
+        )
+        self.auth.get_user_permissions(1)
+
+        # 数据库中的角色发生变更
+        self.auth._load_user_permissions.return_value = (
+            ["tenant_admin"],
+            ["product:read", "product:write"],
+        )
+        assert self.auth.get_user_permissions(1)[0] == ["viewer"]
+
+        self.cache.expire_all()
+        roles, permissions = self.auth.get_user_permissions(1)
+
+        assert roles == ["tenant_admin"]
+        assert "product:write" in permissions
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
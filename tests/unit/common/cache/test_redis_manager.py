@@ -0,0 +1,178 @@
+"""Redis缓存管理器单元测试"""
+
+import asyncio
+
+import pytest
+from unittest.mock import Mock, patch
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..')))
+
+from amazon_tracker.common.cache.redis_manager import (
+    CLEAR_PATTERN_DELETE_BATCH,
+    AsyncBlockingConnectionPool,
+    RedisCache,
+    _json_dumps_bytes,
+    _json_loads,
+    cache_result,
+)
+from amazon_tracker.common.config.settings import get_settings
+
+
+class TestCacheResultKey:
+    """cache_result缓存键测试"""
+
+    def _captured_keys(self, mock_cache):
+        return [c.args[0] for c in mock_cache.set.call_args_list]
+
+    @patch('amazon_tracker.common.cache.redis_manager.cache_manager')
+    def test_method_key_ignores_instance(self, mock_cache):
+        """不同实例调用同一方法时缓存键一致"""
+        mock_cache.get.return_value = None
+
+        class Generator:
+            @cache_result(ttl=60, prefix="test")
+            def build(self, asin, days=7):
+                return {"asin": asin, "days": days}
+
+        Generator().build("B000000001", days=30)
+        Generator().build("B000000001", days=30)
+
+        keys = self._captured_keys(mock_cache)
+        assert len(keys) == 2
+        assert keys[0] == keys[1]
+        assert "object at" not in keys[0]
+
+    @patch('amazon_tracker.common.cache.redis_manager.cache_manager')
+    def test_key_depends_on_arguments(self, mock_cache):
+        """参数不同时缓存键不同"""
+        mock_cache.get.return_value = None
+
+        @cache_result(ttl=60, prefix="test")
+        def build(asin):
+            return {"asin": asin}
+
+        build("B000000001")
+        build("B000000002")
+
+        keys = self._captured_keys(mock_cache)
+        assert keys[0] != keys[1]
+
+    @patch('amazon_tracker.common.cache.redis_manager.cache_manager')
+    def test_cache_hit_skips_call(self, mock_cache):
+        """命中缓存时不执行被装饰函数"""
+        mock_cache.get.return_value = {"cached": True}
+        inner = Mock()
+
+        @cache_result(ttl=60, prefix="test")
+        def build(asin):
+            return inner(asin)
+
+        assert build("B000000001") == {"cached": True}
+        inner.assert_not_called()
+        mock_cache.set.assert_not_called()
+
+
+class TestCacheResultShouldCache:
+    """cache_result写入条件测试"""
+
+    @patch('amazon_tracker.common.cache.redis_manager.cache_manager')
+    def test_rejected_result_not_cached(self, mock_cache):
+        """should_cache返回False的结果不写入缓存"""
+        mock_cache.get.return_value = None
+
+        @cache_result(
+            ttl=60, prefix="test", should_cache=lambda result: "error" not in result
+        )
+        def build(asin):
+            if asin == "missing":
+                return {"error": "No products found"}
+            return {"asin": asin}
+
+        assert build("missing") == {"error": "No products found"}
+        mock_cache.set.assert_not_called()
+
+        build("B000000001")
+        mock_cache.set.assert_called_once()
+
+
+class TestJsonSerialization:
+    """缓存值序列化测试"""
+
+    def test_numpy_values_stay_numeric(self):
+        """numpy标量和数组序列化为数值而不是字符串"""
+        np = pytest.importorskip("numpy")
+
+        data = {
+            "price": np.float64(19.99),
+            "rank": np.int64(42),
+            "history": np.array([1, 2, 3]),
+        }
+
+        assert _json_loads(_json_dumps_bytes(data)) == {
+            "price": 19.99,
+            "rank": 42,
+            "history": [1, 2, 3],
+        }
+
+    def test_unknown_objects_fall_back_to_str(self):
+        """其他无法编码的对象转为字符串"""
+        from decimal import Decimal
+
+        assert _json_loads(_json_dumps_bytes({"v": Decimal("1.50")})) == {"v": "1.50"}
+
+
+class TestClearPattern:
+    """按模式清理缓存测试"""
+
+    def test_keys_unlinked_per_batch(self):
+        """匹配的键按批次UNLINK，不在单个管道中累积"""
+        cache = RedisCache("redis://localhost:6379/0")
+        cache._client = Mock()
+        total = CLEAR_PATTERN_DELETE_BATCH * 2 + 1
+        cache._client.scan_iter.return_value = iter(
+            f"amazon_tracker:report:{i}".encode() for i in range(total)
+        )
+        cache._client.unlink.side_effect = lambda *keys: len(keys)
+
+        assert cache.clear_pattern("report:*") == total
+        batch_sizes = [len(c.args) for c in cache._client.unlink.call_args_list]
+        assert batch_sizes == [CLEAR_PATTERN_DELETE_BATCH, CLEAR_PATTERN_DELETE_BATCH, 1]
+        cache._client.pipeline.assert_not_called()
+
+
+class TestAsyncClient:
+    """异步客户端测试"""
+
+    def test_client_rebuilt_for_new_loop(self):
+        """事件循环变化时重建客户端并释放旧连接池"""
+        cache = RedisCache("redis://localhost:6379/0")
+
+        async def current_client():
+            return cache.async_client
+
+        first = asyncio.run(current_client())
+        with patch.object(first.connection_pool, 'reset') as mock_reset:
+            second = asyncio.run(current_client())
+
+        assert first is not second
+        mock_reset.assert_called_once()
+
+    def test_client_uses_bounded_blocking_pool(self):
+        """异步客户端使用与同步客户端相同上限的阻塞连接池"""
+        cache = RedisCache("redis://localhost:6379/0")
+        settings = get_settings()
+
+        async def current_client():
+            return cache.async_client
+
+        pool = asyncio.run(current_client()).connection_pool
+
+        assert isinstance(pool, AsyncBlockingConnectionPool)
+        assert pool.max_connections == settings.REDIS_POOL_MAX
+        assert pool.timeout == settings.REDIS_POOL_TIMEOUT
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
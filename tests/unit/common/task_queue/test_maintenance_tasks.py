@@ -0,0 +1,91 @@
+"""维护任务单元测试"""
+
+import pytest
+from unittest.mock import MagicMock, Mock, patch
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..')))
+
+from amazon_tracker.common.auth.jwt_auth import SESSION_ACTIVITY_KEY
+from amazon_tracker.common.task_queue.maintenance_tasks import flush_session_activity
+
+PROCESSING_KEY = f"{SESSION_ACTIVITY_KEY}:processing"
+
+
+class TestFlushSessionActivity:
+    """会话活动批量写回任务测试"""
+
+    def setup_method(self):
+        """测试前设置"""
+        self.client = Mock()
+        self.pipe = Mock()
+        self.client.pipeline.return_value = self.pipe
+        self.client.zrange.return_value = [(b"session-1", 1760000000.0)]
+
+        self.db = MagicMock()
+        self.db_ctx = MagicMock()
+        self.db_ctx.__enter__.return_value = self.db
+
+    def _run(self):
+        with patch(
+            'amazon_tracker.common.task_queue.maintenance_tasks.cache_manager'
+        ) as mock_cache, patch(
+            'amazon_tracker.common.task_queue.maintenance_tasks.get_db_session',
+            return_value=self.db_ctx,
+        ):
+            mock_cache.client = self.client
+            return flush_session_activity.run()
+
+    def test_merges_pending_into_processing_key(self):
+        """待写入记录与遗留的处理中记录合并"""
+        self._run()
+
+        self.client.pipeline.assert_called_once_with(transaction=True)
+        self.pipe.zunionstore.assert_called_once_with(
+            PROCESSING_KEY, [PROCESSING_KEY, SESSION_ACTIVITY_KEY], aggregate="MAX"
+        )
+        self.pipe.delete.assert_called_once_with(SESSION_ACTIVITY_KEY)
+        self.pipe.execute.assert_called_once()
+
+    def test_success_deletes_processing_key(self):
+        """提交成功后删除处理中键"""
+        result = self._run()
+
+        assert result == {"status": "success", "updated_sessions": 1}
+        self.db.commit.assert_called_once()
+        self.client.delete.assert_called_once_with(PROCESSING_KEY)
+
+        params = self.db.execute.call_args.args[1]
+        assert params[0]["sid"] == "session-1"
+        assert params[0]["ts"].tzinfo is None
+
+    def test_failed_commit_keeps_processing_key_for_retry(self):
+        """数据库写入失败时保留处理中键，下次运行重试"""
+        self.db.commit.side_effect = Exception("database unavailable")
+
+        result = self._run()
+
+        assert result["status"] == "failed"
+        self.client.delete.assert_not_called()
+
+        # 下次运行：遗留记录合并后重新写入并清理
+        self.db.commit.side_effect = None
+        result = self._run()
+
+        assert result == {"status": "success", "updated_sessions": 1}
+        self.client.delete.assert_called_once_with(PROCESSING_KEY)
+
+    def test_no_pending_entries(self):
+        """没有待写入记录时不访问数据库"""
+        self.client.zrange.return_value = []
+
+        result = self._run()
+
+        assert result == {"status": "success", "updated_sessions": 0}
+        self.db.execute.assert_not_called()
+        self.client.delete.assert_not_called()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,94 @@
+"""批量导入API端点单元测试"""
+
+import asyncio
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../..')))
+
+from amazon_tracker.services.core_service.api.v1.bulk_import import (
+    BulkImportRequest,
+    bulk_import_by_asins,
+)
+
+
+class TestBulkImportByAsins:
+    """ASIN批量导入端点测试"""
+
+    def setup_method(self):
+        """测试前设置"""
+        self.current_user = {"tenant_id": "tenant_demo", "user_id": 4}
+        self.db = MagicMock()
+        # 租户下已存在的产品
+        self.db.query.return_value.filter.return_value.all.return_value = [
+            ("B000000001", 11)
+        ]
+        self.added = []
+        self.db.add_all.side_effect = self.added.extend
+
+        self.permission_patcher = patch(
+            'amazon_tracker.services.core_service.api.v1.bulk_import.require_permission'
+        )
+        self.crawl_patcher = patch(
+            'amazon_tracker.services.core_service.api.v1.bulk_import.crawl_amazon_product'
+        )
+        self.permission_patcher.start()
+        self.mock_crawl = self.crawl_patcher.start()
+
+    def teardown_method(self):
+        """测试后清理"""
+        self.permission_patcher.stop()
+        self.crawl_patcher.stop()
+
+    def _import(self, asins):
+        request = BulkImportRequest(asins=asins, auto_crawl=True)
+        return asyncio.run(
+            bulk_import_by_asins(request, current_user=self.current_user, db=self.db)
+        )
+
+    def test_mixed_batch_created_in_single_flush(self):
+        """新产品一次flush写入，重复和无效ASIN分别报告"""
+
+        def assign_ids():
+            for product_id, product in enumerate(self.added, 100):
+                product.id = product_id
+
+        self.db.flush.side_effect = assign_ids
+
+        result = self._import(
+            ["B000000001", "B000000002", "B000000003", "B000000002", "bad"]
+        )
+
+        assert result.successful_imports == 2
+        assert result.duplicate_products == 2
+        assert result.failed_asins == ["bad"]
+        self.db.flush.assert_called_once()
+        assert self.mock_crawl.delay.call_count == 2
+        self.db.commit.assert_called_once()
+
+        duplicates = {
+            item["asin"]: item["product_id"]
+            for item in result.import_details
+            if item["status"] == "Already exists"
+        }
+        assert duplicates == {"B000000001": 11, "B000000002": 100}
+
+    def test_flush_failure_reports_new_asins_as_failed(self):
+        """批量写入失败时新ASIN全部记为失败，重复ASIN仍正常报告"""
+        self.db.flush.side_effect = Exception("duplicate key value")
+
+        result = self._import(["B000000001", "B000000002", "B000000003", "bad"])
+
+        assert result.successful_imports == 0
+        assert result.duplicate_products == 1
+        assert result.failed_imports == 3
+        assert sorted(result.failed_asins) == ["B000000002", "B000000003", "bad"]
+        self.db.rollback.assert_called_once()
+        self.mock_crawl.delay.assert_not_called()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])